@@ -2,7 +2,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from ultranest.mlfriends import AffineLayer, MLFriends
 from ultranest.samplingpath import SamplingPath, ContourSamplingPath
-from ultranest.samplingpath import box_line_intersection, nearest_box_intersection_line, linear_steps_with_reflection, angle, get_sphere_tangents, norm
+from ultranest.samplingpath import box_line_intersection, nearest_box_intersection_line, nearest_box_intersection_line_batch, linear_steps_with_reflection, angle, get_sphere_tangents, norm
 from numpy.testing import assert_allclose
 
 def test_horizontal():
@@ -129,6 +129,21 @@ def test_random():
         
         
 
+def test_batch():
+    np.random.seed(42)
+    for ndim in 1, 2, 7:
+        starts = np.random.uniform(size=(20, ndim))
+        directions = np.random.normal(size=(20, ndim))
+        directions /= ((directions**2).sum(axis=1)**0.5).reshape((-1, 1))
+        for fwd in True, False:
+            ps, ts, axes = nearest_box_intersection_line_batch(starts, directions, fwd=fwd)
+            for start, direction, p, t, ax in zip(starts, directions, ps, ts, axes):
+                pref, tref, axref = nearest_box_intersection_line(start, direction, fwd=fwd)
+                np.testing.assert_allclose(p, pref)
+                np.testing.assert_allclose(t, tref)
+                assert ax in axref
+
+
 def test_forward(plot=False):
     np.random.seed(1)
     for j in range(40):
@@ -197,6 +212,17 @@ def test_samplingpath():
     assert L1 is None, L1
     assert on_path
 
+    # points are kept sorted by index, regardless of insertion order
+    assert [i for i, _, _, _ in path.points] == [-1, 0, 4]
+
+    # reduced precision storage is opt-in
+    path32 = SamplingPath(x0, v0, L0, dtype=np.float32)
+    path32.add(1, x0 + v0, v0, 1.0)
+    assert all(x.dtype == np.float32 for _, x, _, _ in path32.points)
+    x1, v1, _, on_path = path32.interpolate(1)
+    assert_allclose(x1, x0 + v0, atol=1e-6)
+    assert on_path
+
 def test_samplingpath_cubereflect():
     x0 = np.array([0.1, 0.1])
     v0 = np.array([0.1, 0.01])
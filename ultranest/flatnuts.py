@@ -49,12 +49,26 @@ Drawbacks:
 """
 
 
+import bisect
+
 import numpy as np
 from numpy.linalg import norm
-import matplotlib.pyplot as plt
 from .samplingpath import angle, extrapolate_ahead
 
 
+def _lookup_point(samplingpath, i):
+    """Return the path point with index `i`, or None if not evaluated yet.
+
+    Binary search on the sorted path indices, instead of scanning
+    all points.
+    """
+    idx = samplingpath._idx
+    k = bisect.bisect_left(idx, i)
+    if k != len(idx) and idx[k] == i:
+        return samplingpath.points[k]
+    return None
+
+
 class SingleJumper(object):
     """ Jump on step at a time. If unsuccessful, reverse direction. """
     def __init__(self, stepsampler, nsteps=0):
@@ -71,26 +85,26 @@ class SingleJumper(object):
         target = self.currenti + self.direction
         self.stepsampler.set_nsteps(target)
     
-    def check_gaps(self, gaps):
+    def check_gaps(self, gaps=None):
         # gaps cannot happen, because we make each jump explicitly
         pass
     # then user runs stepsampler until it is done
     
-    def make_jump(self, gaps={}):
+    def make_jump(self, gaps=None):
         target = self.currenti + self.direction
-        pointi = [(j, xj, vj, Lj) for j, xj, vj, Lj in self.stepsampler.points if j == target]
-        accept = len(pointi) > 0
-        if accept:
+        path = self.stepsampler.contourpath.samplingpath
+        pointi = _lookup_point(path, target)
+        if pointi is not None:
             self.currenti = target
             self.naccepts += 1
         else:
-            pointi = [(j, xj, vj, Lj) for j, xj, vj, Lj in self.stepsampler.points if j == self.currenti]
+            pointi = _lookup_point(path, self.currenti)
             # reverse
             self.direction *= -1
             self.nrejects += 1
         
         self.isteps += 1
-        return pointi[0][1], pointi[0][3]
+        return pointi[1], pointi[3]
 
 
 class DirectJumper(object):
@@ -102,23 +116,39 @@ class DirectJumper(object):
         self.nsteps = nsteps
         self.isteps = 0
         self.currenti = 0
-        self.naccepts = 0
-        self.nrejects = 0
+        # accepts and rejects, in one unboxed array ([0]=accepts, [1]=rejects)
+        self._counts = np.zeros(2, dtype=np.int64)
         self.log = log
+
+    @property
+    def naccepts(self):
+        return int(self._counts[0])
+
+    @naccepts.setter
+    def naccepts(self, value):
+        self._counts[0] = value
+
+    @property
+    def nrejects(self):
+        return int(self._counts[1])
+
+    @nrejects.setter
+    def nrejects(self, value):
+        self._counts[1] = value
     
     def prepare_jump(self):
         target = self.currenti + self.nsteps
         self.stepsampler.set_nsteps(target)
     
     # then user runs stepsampler until it is done
-    def check_gaps(self, gaps):
-        pointi = {j: (xj, Lj) for j, xj, vj, Lj in self.stepsampler.points}
-        ilo, ihi = min(pointi.keys()), max(pointi.keys())
+    def check_gaps(self, gaps=None):
+        path = self.stepsampler.contourpath.samplingpath
+        ilo, ihi = path._idx[0], path._idx[-1]
         currenti = self.currenti
         direction = self.direction
         for isteps in range(self.nsteps):
             target = currenti + direction
-            accept = ilo <= target <= ihi and not gaps.get(target, False)
+            accept = ilo <= target <= ihi and not (gaps is not None and gaps[target] == 1)
             if accept:
                 currenti = target
                 if self.log:
@@ -132,11 +162,11 @@ class DirectJumper(object):
         if self.log: print("--> %d" % currenti)
         # double-check that final point is OK:
         # if we already evaluated it, it is OK
-        if currenti in pointi:
+        if _lookup_point(path, currenti) is not None:
             return None, None
         
-        if currenti in gaps:
-            assert gaps[currenti] == False, "could not have jumped into a known gap"
+        if gaps is not None and gaps[currenti] != 0:
+            assert gaps[currenti] == 2, "could not have jumped into a known gap"
             return None, None
         
         xj, vj, Lj, onpath = self.stepsampler.contourpath.interpolate(currenti)
@@ -145,43 +175,61 @@ class DirectJumper(object):
         
         if self.log: print("    checking for gap ...")
         # otherwise ask caller to verify it and call us again with
-        # gaps[i] = True if outside, gaps[i] = False if OK
+        # gaps[i] = 1 if outside, gaps[i] = 2 if OK
         return xj, currenti
     
-    def make_jump(self, gaps={}):
-        pointi = {j: (xj, Lj) for j, xj, vj, Lj in self.stepsampler.points}
-        ilo, ihi = min(pointi.keys()), max(pointi.keys())
+    def make_jump(self, gaps=None):
+        path = self.stepsampler.contourpath.samplingpath
+        ilo, ihi = path._idx[0], path._idx[-1]
         
         for self.isteps in range(self.nsteps):
             target = self.currenti + self.direction
-            accept = ilo <= target <= ihi and not gaps.get(target, False)
+            accept = ilo <= target <= ihi and not (gaps is not None and gaps[target] == 1)
             if accept:
                 if self.log:
                     print("accepted jump %d->%d" % (self.currenti, target), 'fwd' if self.direction == 1 else 'rwd')
                 self.currenti = target
-                self.naccepts += 1
+                self._counts[0] += 1
             else:
                 if self.log:
                     print("rejected jump %d->%d" % (self.currenti, target), 'fwd' if self.direction == 1 else 'rwd')
                 # reverse
                 self.direction *= -1
-                self.nrejects += 1
+                self._counts[1] += 1
         self.isteps += 1
         
-        return pointi[self.currenti]
+        _, xj, _, Lj = _lookup_point(path, self.currenti)
+        return xj, Lj
 
 
 class IntervalJumper(object):
     """ Use interval to choose final point randomly """
-    def __init__(self, stepsampler, nsteps):
+    def __init__(self, stepsampler, nsteps, log=False):
         self.stepsampler = stepsampler
         self.direction = +1
         assert nsteps >= 0
         self.nsteps = nsteps
         self.isteps = 0
         self.currenti = 0
-        self.naccepts = 0
-        self.nrejects = 0
+        # accepts and rejects, in one unboxed array ([0]=accepts, [1]=rejects)
+        self._counts = np.zeros(2, dtype=np.int64)
+        self.log = log
+
+    @property
+    def naccepts(self):
+        return int(self._counts[0])
+
+    @naccepts.setter
+    def naccepts(self, value):
+        self._counts[0] = value
+
+    @property
+    def nrejects(self):
+        return int(self._counts[1])
+
+    @nrejects.setter
+    def nrejects(self, value):
+        self._counts[1] = value
     
     def prepare_jump(self):
         target = self.currenti + self.nsteps
@@ -191,8 +239,8 @@ class IntervalJumper(object):
     # then user runs stepsampler until it is done
     
     def make_jump(self):
-        pointi = {j: (xj, Lj) for j, xj, vj, Lj in self.stepsampler.points}
-        ilo, ihi = min(pointi.keys()), max(pointi.keys())
+        path = self.stepsampler.contourpath.samplingpath
+        ilo, ihi = path._idx[0], path._idx[-1]
         a, b = self.nutssampler.validrange
         nused = b - a
         # these were not used:
@@ -245,6 +293,7 @@ class ClockedSimpleStepSampler(object):
         assert np.isclose(norm(vnew), norm(v)), (vnew, v, norm(vnew), norm(v))
         #isunitlength(vnew)
         if plot:
+            import matplotlib.pyplot as plt
             plt.plot([reflpoint[0], (-v + reflpoint)[0]], [reflpoint[1], (-v + reflpoint)[1]], '-', color='k', lw=2, alpha=0.5)
             plt.plot([reflpoint[0], (vnew + reflpoint)[0]], [reflpoint[1], (vnew + reflpoint)[1]], '-', color='k', lw=3)
         return vnew
@@ -258,18 +307,59 @@ class ClockedSimpleStepSampler(object):
     def expand_onestep(self, fwd, transform, loglike, Lmin):
         """ Helper interface, make one step (forward fwd=True or backward fwd=False) """
         if fwd:
-            starti, _, _, _ = max(self.points)
+            starti, _, _, _ = self.points[-1]
             i = starti + 1
         else:
-            starti, _, _, _ = min(self.points)
+            starti, _, _, _ = self.points[0]
             i = starti - 1
         return self.expand_to_step(i, transform, loglike, Lmin)
 
+    # whether expand_to_step may batch-evaluate the straight trajectory
+    speculative_expand = False
+
     def expand_to_step(self, nsteps, transform, loglike, Lmin):
         """ Helper interface, go to step nstep """
+        if self.speculative_expand:
+            self.presample_until(nsteps, transform, loglike, Lmin)
         self.set_nsteps(nsteps)
         return self.get_independent_sample(transform, loglike, Lmin)
 
+    def presample_until(self, i, transform, loglike, Lmin):
+        """Batch-evaluate the straight trajectory towards step `i`.
+
+        `transform` and `loglike` must be vectorized. The contiguous run
+        of trajectory points above the `Lmin` threshold is added to the
+        path in a single transform/loglike call; the first point below
+        the threshold is left to the step-by-step reflection handling.
+        Returns the number of likelihood evaluations spent.
+        """
+        path = self.contourpath.samplingpath
+        if i > 0 and path.fwd_possible:
+            starti, x, v, _ = self.points[-1]
+            sign = 1
+            deltai = i - starti
+        elif i < 0 and path.rwd_possible:
+            starti, x, v, _ = self.points[0]
+            sign = -1
+            deltai = starti - i
+        else:
+            return 0
+        if deltai < 2:
+            # nothing to gain over the plain step-by-step evaluation
+            return 0
+        xs = np.empty((deltai, len(x)))
+        vs = np.empty((deltai, len(x)))
+        for k in range(deltai):
+            x, _v = extrapolate_ahead(sign, x, v, contourpath=self.contourpath, out=xs[k,:])
+            vs[k,:] = _v
+            v = vs[k,:]
+        Ls = loglike(transform(xs))
+        for k in range(deltai):
+            if Ls[k] < Lmin:
+                break
+            self.contourpath.add(starti + (k + 1) * sign, xs[k,:], vs[k,:], Ls[k])
+        return deltai
+
     def get_independent_sample(self, transform, loglike, Lmin):
         """ Helper interface, call next() until a independent sample is returned """
         Llast = None
@@ -293,6 +383,10 @@ class ClockedStepSampler(ClockedSimpleStepSampler):
     Find a new point with a series of small steps
     """
 
+    # every intermediate step is evaluated anyway, so the straight
+    # trajectory can be evaluated speculatively in one batch
+    speculative_expand = True
+
     def continue_sampling(self, i):
         if i > 0 and self.contourpath.samplingpath.fwd_possible \
         or i < 0 and self.contourpath.samplingpath.rwd_possible:
@@ -303,10 +397,10 @@ class ClockedStepSampler(ClockedSimpleStepSampler):
             # we are not done, but cannot reach the goal.
             # reverse. Find position from where to reverse
             if i > 0:
-                starti, _, _, _ = max(self.points)
+                starti, _, _, _ = self.points[-1]
                 reversei = starti + 1
             else:
-                starti, _, _, _ = min(self.points)
+                starti, _, _, _ = self.points[0]
                 reversei = starti - 1
             if self.log: print("reversing at %d..." % starti)
             # how many steps are missing?
@@ -321,7 +415,7 @@ class ClockedStepSampler(ClockedSimpleStepSampler):
     
     def expand_to(self, i):
         if i > 0 and self.contourpath.samplingpath.fwd_possible:
-            starti, startx, startv, _ = max(self.points)
+            starti, startx, startv, _ = self.points[-1]
             if i > starti:
                 if self.log: print("going forward...", i, starti)
                 j = starti + 1
@@ -335,7 +429,7 @@ class ClockedStepSampler(ClockedSimpleStepSampler):
                 # we are already done
                 pass
         elif i < 0 and self.contourpath.samplingpath.rwd_possible:
-            starti, startx, startv, _ = min(self.points)
+            starti, startx, startv, _ = self.points[0]
             if i < starti:
                 if self.log: print("going backwards...", i, starti)
                 j = starti - 1
@@ -361,7 +455,9 @@ class ClockedStepSampler(ClockedSimpleStepSampler):
             # We stepped outside, so now we need to reflect
             self.nreflections += 1
             if self.log: print("reflecting:", xj, v)
-            if self.plot: plt.plot(xj[0], xj[1], 'xr')
+            if self.plot:
+                import matplotlib.pyplot as plt
+                plt.plot(xj[0], xj[1], 'xr')
             vk = self.reverse(xj, v * sign, plot=self.plot) * sign
             if self.log: print("new direction:", vk)
             xk, vk = extrapolate_ahead(sign, xj, vk, contourpath=self.contourpath)
@@ -376,7 +472,9 @@ class ClockedStepSampler(ClockedSimpleStepSampler):
             self.contourpath.add(j, xk, vk, Llast)
         else:
             # we are stuck and have to give up this direction
-            if self.plot: plt.plot(xk[0], xk[1], 's', mfc='None', mec='r', ms=10)
+            if self.plot:
+                import matplotlib.pyplot as plt
+                plt.plot(xk[0], xk[1], 's', mfc='None', mec='r', ms=10)
             if sign == 1:
                 self.contourpath.samplingpath.fwd_possible = False
             else:
@@ -407,10 +505,10 @@ class ClockedStepSampler(ClockedSimpleStepSampler):
 
                 # find point
                 # here we assume all intermediate points have been sampled
-                pointi = [(j, xj, vj, Lj) for j, xj, vj, Lj in self.points if j == i]
-                if len(pointi) != 0:
+                pointi = _lookup_point(self.contourpath.samplingpath, i)
+                if pointi is not None:
                     # return the previously sampled point
-                    _, xj, _, Lj = pointi[0]
+                    _, xj, _, Lj = pointi
                     if self.log: print("returning point", i)
                     return (xj, Lj), True
                 
@@ -443,15 +541,20 @@ class ClockedBisectSampler(ClockedStepSampler):
     """
     Step sampler that does not require each step to be evaluated
     """
-    
+
+    # bisection skips intermediate evaluations by design; evaluating
+    # the whole trajectory up front would defeat that
+    speculative_expand = False
+
+
     def continue_sampling(self, i):
         if i > 0:
-            starti, _, _, _ = max(self.points)
+            starti, _, _, _ = self.points[-1]
             #fwd = True
             inside = i < starti
             more_possible = self.contourpath.samplingpath.fwd_possible
         else:
-            starti, _, _, _ = min(self.points)
+            starti, _, _, _ = self.points[0]
             #fwd = False
             inside = starti < i
             more_possible = self.contourpath.samplingpath.rwd_possible
@@ -470,10 +573,10 @@ class ClockedBisectSampler(ClockedStepSampler):
             # we are not done, but cannot reach the goal.
             # reverse. Find position from where to reverse
             if i > 0:
-                starti, _, _, _ = max(self.points)
+                starti, _, _, _ = self.points[-1]
                 reversei = starti + 1
             else:
-                starti, _, _, _ = min(self.points)
+                starti, _, _, _ = self.points[0]
                 reversei = starti - 1
             if self.log: print("reversing at %d..." % starti)
             # how many steps are missing?
@@ -491,7 +594,7 @@ class ClockedBisectSampler(ClockedStepSampler):
         
         if j > 0 and self.contourpath.samplingpath.fwd_possible:
             #print("going forward...", j)
-            starti, startx, startv, _ = max(self.points)
+            starti, startx, startv, _ = self.points[-1]
             if j > starti:
                 xj, v = self.contourpath.extrapolate(j)
                 self.goals.insert(0, ('bisect', starti, startx, startv, None, None, None, j, xj, v, +1))
@@ -503,7 +606,7 @@ class ClockedBisectSampler(ClockedStepSampler):
                 pass
         elif j < 0 and self.contourpath.samplingpath.rwd_possible:
             #print("going backward...", j)
-            starti, startx, startv, _ = min(self.points)
+            starti, startx, startv, _ = self.points[0]
             if j < starti:
                 xj, v = self.contourpath.extrapolate(j)
                 self.goals.insert(0, ('bisect', starti, startx, startv, None, None, None, j, xj, v, -1))
@@ -555,7 +658,9 @@ class ClockedBisectSampler(ClockedStepSampler):
         if midi == lefti or midi == righti:
             # we are done bisecting. right is the first point outside
             if self.log: print("  bisecting gave reflection point", righti, rightx, rightv)
-            if self.plot: plt.plot(rightx[0], rightx[1], 'xr')
+            if self.plot:
+                import matplotlib.pyplot as plt
+                plt.plot(rightx[0], rightx[1], 'xr')
             # compute reflected direction
             vk = self.reverse(rightx, rightv * sign, plot=self.plot) * sign
             if self.log: print("  reversing there", rightv)
@@ -600,11 +705,11 @@ class ClockedBisectSampler(ClockedStepSampler):
                     return (startx, startL), True
 
                 # check if point already sampled
-                pointi = [(j, xj, vj, Lj) for j, xj, vj, Lj in self.points if j == i]
+                pointi = _lookup_point(self.contourpath.samplingpath, i)
 
-                if len(pointi) == 1:
+                if pointi is not None:
                     # return the previously sampled point
-                    _, xj, _, Lj = pointi[0]
+                    _, xj, _, Lj = pointi
                     return (xj, Lj), True
                 
                 self.continue_sampling(i)
@@ -658,11 +763,11 @@ class ClockedNUTSSampler(ClockedBisectSampler):
         while not self.tree_built:
             if self.log: print("continue building tree")
             rwd = self.current_direction
-            
-            if True or self.tree_depth > 7:
+
+            if self.log:
                 print("NUTS step: tree depth %d, %s" % (self.tree_depth, "rwd" if rwd else "fwd"))
-            
-            
+
+
             # make sure the path is prepared for the desired tree
             if rwd:
                 goal = ('expand-to', self.left_state[0] - 2**self.tree_depth)
@@ -687,11 +792,14 @@ class ClockedNUTSSampler(ClockedBisectSampler):
             
             if not newstop:
                 self.validrange = (min(self.validrange[0], newrange[0]), max(self.validrange[1], newrange[1]))
-                print("  new NUTS range: %d..%d" % (self.validrange[0], self.validrange[1]))
+                if self.log:
+                    print("  new NUTS range: %d..%d" % (self.validrange[0], self.validrange[1]))
             
             ileft, xleft, vleft = self.left_state
             iright, xright, vright = self.right_state
-            if self.plot: plt.plot([xleft[0], xright[0]], [xleft[1] + (self.tree_depth+1)*0.02, xright[1] + (self.tree_depth+1)*0.02], '--')
+            if self.plot:
+                import matplotlib.pyplot as plt
+                plt.plot([xleft[0], xright[0]], [xleft[1] + (self.tree_depth+1)*0.02, xright[1] + (self.tree_depth+1)*0.02], '--')
             #if j > 5:
             #   print("  first-to-last arrow", ileft, iright, xleft, xright, xright-xleft, " velocities:", vright, vleft)
             #   print("  stopping criteria: ", newstop, angle(xright-xleft, vleft), angle(xright-xleft, vright))
@@ -709,7 +817,8 @@ class ClockedNUTSSampler(ClockedBisectSampler):
                 self.current_direction = np.random.randint(2) == 1
         
         # Tree was built, we only need to sample from it
-        print("sampling between", self.validrange)
+        if self.log:
+            print("sampling between", self.validrange)
         return self.sample_chain_point(self.validrange[0], self.validrange[1])
     
     def sample_chain_point(self, a, b):
@@ -719,7 +828,8 @@ class ClockedNUTSSampler(ClockedBisectSampler):
             where is_independent is always True
         
         """
-        if self.plot: 
+        if self.plot:
+            import matplotlib.pyplot as plt
             for i in range(a, b+1):
                 xi, vi, Li, onpath = self.contourpath.interpolate(i)
                 plt.plot(xi[0], xi[1], '_ ', color='b', ms=10, mew=2)
@@ -739,31 +849,53 @@ class ClockedNUTSSampler(ClockedBisectSampler):
         j: int height of the tree
         rwd: bool whether we go backward
         """
-        if j == 0:
-            # base case: go forward one step
-            i = startstate[0] + (-1 if rwd else +1)
-            #self.expand_to_step(i)
+        # The tree doubling is done iteratively: walk the 2**j new leaves
+        # one by one, and whenever a complete subtree of depth d closes
+        # (every 2**d leaves, tracked by the binary counter n), apply the
+        # U-turn checks between its first and last leaf. This visits the
+        # same leaves and performs the same checks as the recursive
+        # formulation, without 2**(j+1) Python frames.
+        i0 = startstate[0]
+        sign = -1 if rwd else +1
+        # first leaf of the currently open subtree, for each depth
+        openstates = [None] * (j + 1)
+        firststate = None
+        stop = False
+        for n in range(1, 2**j + 1):
+            i = i0 + n * sign
             #print("  build_tree@%d" % i, rwd, self.contourpath.samplingpath.fwd_possible, self.contourpath.samplingpath.rwd_possible)
             xi, vi, _, _ = self.contourpath.interpolate(i)
-            if self.plot: plt.plot(xi[0], xi[1], 'x', color='gray')
-            # this is a good state, so return it
-            return (i, xi, vi), (i, xi, vi), (i,i), False
-        
-        # recursion-build the left and right subtrees
-        (ileft, xleft, vleft), (iright, xright, vright), rangea, stopa = self.build_tree(startstate, j-1, rwd)
-        if stopa:
-            #print("  one subtree already terminated; returning")
-            #plt.plot([xright[0], xleft[0]], [xright[1], xleft[1]], ':', color='navy')
-            return (ileft, xleft, vleft), (iright, xright, vright), (ileft,iright), stopa
+            if self.plot:
+                import matplotlib.pyplot as plt
+                plt.plot(xi[0], xi[1], 'x', color='gray')
+            state = (i, xi, vi)
+            if firststate is None:
+                firststate = state
+            for d in range(1, j + 1):
+                if (n - 1) % 2**d == 0:
+                    openstates[d] = state
+                else:
+                    break
+            for d in range(1, j + 1):
+                if n % 2**d != 0:
+                    break
+                # subtree of depth d is complete; check it for U-turns.
+                # NUTS criterion: start to end vector must point in the same direction as velocity at end-point
+                # additional criterion: start and end velocities must point in opposite directions
+                if rwd:
+                    _, xleft, vleft = state
+                    _, xright, vright = openstates[d]
+                else:
+                    _, xleft, vleft = openstates[d]
+                    _, xright, vright = state
+                if angle(xright - xleft, vleft) <= 0 or angle(xright - xleft, vright) <= 0 or angle(vleft, vright) <= 0:
+                    stop = True
+                    break
+            if stop:
+                break
         if rwd:
-            # go back
-            (ileft, xleft, vleft), _, rangeb, stopb = self.build_tree((ileft, xleft, vleft), j-1, rwd)
+            leftstate, rightstate = state, firststate
         else:
-            _, (iright, xright, vright), rangeb, stopb = self.build_tree((iright, xright, vright), j-1, rwd)
-        #print("  subtree termination at %d" % j, stopa, stopb, angle(xright-xleft, vleft), angle(xright-xleft, vright), angle(vleft, vright))
-        #plt.plot([xright[0], xleft[0]], [xright[1], xleft[1]], ':', color='gray')
-        # NUTS criterion: start to end vector must point in the same direction as velocity at end-point
-        # additional criterion: start and end velocities must point in opposite directions
-        stop = stopa or stopb or angle(xright-xleft, vleft) <= 0 or angle(xright-xleft, vright) <= 0 or angle(vleft, vright) <= 0
-        return (ileft, xleft, vleft), (iright, xright, vright), (ileft,iright), stop
+            leftstate, rightstate = firststate, state
+        return leftstate, rightstate, (leftstate[0], rightstate[0]), stop
 
@@ -3,13 +3,14 @@
 These features are experimental.
 """
 
+import bisect
+from collections import OrderedDict
+
 import numpy as np
 from numpy import pi
 
-import matplotlib.pyplot as plt
-
 from ultranest.samplingpath import SamplingPath, ContourSamplingPath, extrapolate_ahead
-from ultranest.stepsampler import StepSampler
+from ultranest.stepsampler import StepSampler, _in_unit_cube, _in_unit_cube_mask
 from ultranest.stepsampler import generate_region_oriented_direction, generate_region_random_direction, generate_random_direction
 
 from ultranest.flatnuts import ClockedStepSampler, ClockedBisectSampler, ClockedNUTSSampler
@@ -56,11 +57,33 @@ class SamplingPathSliceSampler(StepSampler):
             self.nrejects += 1
             # continue on current interval
             pass
-        self.logstat.append([accepted, self.scale])
+        self._logstat_append([accepted, self.scale])
 
     def adjust_outside_region(self):
         """Adjust proposal given that we have stepped out of region."""
-        self.logstat.append([False, self.scale])
+        self._logstat_append([False, self.scale])
+
+    def _expand_side(self, region, ui, sign, ndouble):
+        """Double the path length on one side until outside.
+
+        Extrapolates all doubling steps ``sign * 2**k`` up front and
+        checks bounds and region membership in one vectorized call,
+        instead of one region round-trip per doubling.
+        Returns the first step index found outside, or the first one
+        exceeding the maximum length if all are inside.
+        """
+        steps = [sign * 2**k for k in range(ndouble)]
+        if not steps:
+            return sign
+        xs = np.empty((len(steps), len(ui)))
+        for k, j in enumerate(steps):
+            xs[k,:], _ = self.path.extrapolate(j)
+        mask = _in_unit_cube_mask(xs)
+        mask = np.logical_and(mask, region.inside(xs))
+        outside = np.flatnonzero(~mask)
+        if len(outside) > 0:
+            return steps[outside[0]]
+        return steps[-1] * 2
 
     def move(self, ui, region, ndraw=1, plot=False):
         """Advance by slice sampling on the path."""
@@ -69,28 +92,22 @@ class SamplingPathSliceSampler(StepSampler):
             self.path = ContourSamplingPath(SamplingPath(ui, v, 0.0),
                 region)
 
-            if not (ui > 0).all() or not (ui < 1).all() or not region.inside(ui.reshape((1, -1))):
+            buf = self._get_scratch(len(ui))
+            buf[0] = ui
+            if not _in_unit_cube(ui) or not region.inside(buf):
                 assert False, ui
 
             # unit hypercube diagonal gives a reasonable maximum path length
             maxlength = len(ui)**0.5
 
-            # expand direction until it is surely outside
-            left = -1
-            right = +1
-            while abs(left * self.scale) < maxlength:
-                xj, vj = self.path.extrapolate(left)
-                if not (xj > 0).all() or not (xj < 1).all() or not region.inside(xj.reshape((1, -1))):
-                    break
-                # self.path.add(left, xj, vj, 0.0)
-                left *= 2
+            # number of doublings before the path is longer than maxlength
+            ndouble = 0
+            while self.scale * 2**ndouble < maxlength:
+                ndouble += 1
 
-            while abs(right * self.scale) < maxlength:
-                xj, _ = self.path.extrapolate(right)
-                if not (xj > 0).all() or not (xj < 1).all() or not region.inside(xj.reshape((1, -1))):
-                    break
-                # self.path.add(right, xj, vj, 0.0)
-                right *= 2
+            # expand direction until it is surely outside
+            left = self._expand_side(region, ui, -1, ndouble)
+            right = self._expand_side(region, ui, +1, ndouble)
 
             scale = max(-left, right)
             # print("scale %f gave %d %d " % (self.scale, left, right))
@@ -119,7 +136,9 @@ class SamplingPathSliceSampler(StepSampler):
             else:
                 xj, _ = self.path.extrapolate(mid)
 
-            if region.inside(xj.reshape((1, -1))):
+            buf = self._get_scratch(len(xj))
+            buf[0] = xj
+            if region.inside(buf):
                 self.interval = (left, right, mid)
                 return xj.reshape((1, -1))
             else:
@@ -131,7 +150,14 @@ class SamplingPathSliceSampler(StepSampler):
 
 
 class SamplingPathStepSampler(StepSampler):
-    """Step sampler on a sampling path."""
+    """Step sampler on a sampling path.
+
+    Each call makes at most one step and one likelihood evaluation,
+    whose outcome decides the direction of the next step. Reflection
+    probes therefore cannot be batched across steps within a chain;
+    batching likelihood calls requires running several independent
+    samplers side by side.
+    """
 
     def __init__(self, nresets, nsteps, scale=1.0, balance=0.01, nudge=1.1, log=False):
         """Initialise sampler.
@@ -167,6 +193,8 @@ class SamplingPathStepSampler(StepSampler):
         self.grad_function = None
         self.istep = 0
         self.iresets = 0
+        self._cache_i = None
+        self._maxlength = None
         self.start()
         self.terminate_path()
         self.logstat_labels = ['acceptance rate', 'reflection rate', 'scale', 'nstuck']
@@ -179,7 +207,7 @@ class SamplingPathStepSampler(StepSampler):
     def start(self):
         """Start sampler, reset all counters."""
         if hasattr(self, 'naccepts') and self.nrejects + self.naccepts > 0:
-            self.logstat.append([self.naccepts / (self.nrejects + self.naccepts),
+            self._logstat_append([self.naccepts / (self.nrejects + self.naccepts),
                 self.nreflects / (self.nreflects + self.nrejects + self.naccepts),
                 self.scale, self.nstuck])
         self.nrejects = 0
@@ -201,24 +229,64 @@ class SamplingPathStepSampler(StepSampler):
         # print("new direction:", self.scale, self.noutside_regions, self.nrejects, self.naccepts)
 
         v = self.generate_direction(ui, region, scale=self.scale)
+        buf = self._get_scratch(len(ui))
+        buf[0] = ui
         assert (v**2).sum() > 0, (v, self.scale)
-        assert region.inside(ui.reshape((1, -1))).all(), ui
+        assert region.inside(buf).all(), ui
         self.path = ContourSamplingPath(SamplingPath(ui, v, 0.0), region)
         if self.grad_function is not None:
             self.path.gradient = self.grad_function
 
-        if not (ui > 0).all() or not (ui < 1).all() or not region.inside(ui.reshape((1, -1))):
+        if not _in_unit_cube(ui) or not region.inside(buf):
             assert False, ui
 
         self.direction = +1
         self.lasti = 0
-        self.cache = {0: (True, ui, self.last[1])}
+        self._cache_reset(len(ui))
+        self._cache_set(0, True, ui, self.last[1])
         self.deadends = set()
         # self.iresets += 1
         if self.log:
             print()
             print("starting new direction", v, 'from', ui)
 
+    def _cache_reset(self, ndim):
+        """Empty the point cache, allocating it on first use.
+
+        The cache stores the evaluated points of the current path in a
+        ring buffer of parallel arrays indexed by step index. Steps move
+        one index at a time from 0, so the buffer cannot collide within
+        one path.
+        """
+        n = 2 * self.nsteps + 3
+        if self._cache_i is None or self._cache_u.shape != (n, ndim):
+            self._cache_i = np.empty(n, dtype=int)
+            self._cache_ok = np.empty(n, dtype=bool)
+            self._cache_u = np.empty((n, ndim))
+            self._cache_L = np.empty(n)
+        # sentinel index that can never be reached
+        self._cache_i.fill(n + 1)
+
+    def _cache_has(self, i):
+        """Check whether step index `i` is cached."""
+        return self._cache_i[i % len(self._cache_i)] == i
+
+    def _cache_set(self, i, accepted, u, L):
+        """Store point `u` with value `L` under step index `i`."""
+        k = i % len(self._cache_i)
+        self._cache_i[k] = i
+        self._cache_ok[k] = accepted
+        self._cache_u[k,:] = u
+        # L may arrive as a 1-element array from loglike
+        self._cache_L[k] = np.nan if L is None else np.asarray(L).ravel()[0]
+
+    def _cache_get(self, i):
+        """Get (accepted, u, L) stored under step index `i`."""
+        k = i % len(self._cache_i)
+        assert self._cache_i[k] == i, (i, self._cache_i[k])
+        L = self._cache_L[k]
+        return bool(self._cache_ok[k]), self._cache_u[k,:], (None if np.isnan(L) else L)
+
     def terminate_path(self):
         """Terminate current path, and reset path counting variable."""
         # check if we went anywhere:
@@ -244,6 +312,7 @@ class SamplingPathStepSampler(StepSampler):
         def plot_gradient_wrapper(x, plot=False):
             v = grad_function(x)
             if plot:
+                import matplotlib.pyplot as plt
                 plt.plot(x[0], x[1], '+ ', color='k', ms=10)
                 plt.plot([x[0], v[0] * 1e-2 + x[0]], [x[1], v[1] * 1e-2 + x[1]], color='gray')
             return v
@@ -256,7 +325,7 @@ class SamplingPathStepSampler(StepSampler):
 
     def adjust_accept(self, accepted, unew, pnew, Lnew, nc):
         """Adjust proposal given that we have been *accepted* at a new point after *nc* calls."""
-        self.cache[self.nexti] = (accepted, unew, Lnew)
+        self._cache_set(self.nexti, accepted, unew, Lnew)
         if accepted:
             # start at new point next time
             self.lasti = self.nexti
@@ -329,12 +398,15 @@ class SamplingPathStepSampler(StepSampler):
 
     def get_point(self, inew):
         """Get point corresponding to index *inew*."""
-        ipoints = [(u, v) for i, u, p, v in self.path.points if i == inew]
-        if len(ipoints) == 0:
-            # print("getting point %d" % inew, self.path.points) #, "->", self.path.extrapolate(self.nexti))
-            return self.path.extrapolate(inew)
-        else:
-            return ipoints[0]
+        # the path points are kept sorted by index, so a binary search
+        # replaces the previous linear scan over all stored tuples
+        path = self.path.samplingpath
+        k = bisect.bisect_left(path._idx, inew)
+        if k < len(path._idx) and path._idx[k] == inew:
+            _, u, v, _ = path.points[k]
+            return u, v
+        # print("getting point %d" % inew, self.path.points) #, "->", self.path.extrapolate(self.nexti))
+        return self.path.extrapolate(inew)
 
     def __next__(self, region, Lmin, us, Ls, transform, loglike, ndraw=40, plot=False):
         """Get next point.
@@ -366,17 +438,22 @@ class SamplingPathStepSampler(StepSampler):
                 print("wandered out of L constraint; resetting", ui[0])
             ui, Li = None, None
 
-        if Li is not None and not region.inside(ui.reshape((1,-1))):
-            # region was updated and we are not inside anymore
-            # so reset
-            if self.log:
-                print("region change; resetting")
-            ui, Li = None, None
+        if Li is not None:
+            buf = self._get_scratch(len(ui))
+            buf[0] = ui
+            if not region.inside(buf):
+                # region was updated and we are not inside anymore
+                # so reset
+                if self.log:
+                    print("region change; resetting")
+                ui, Li = None, None
 
         if Li is None and self.history:
             # try to resume from a previous point above the current contour
-            for uj, Lj in self.history[::-1]:
-                if Lj >= Lmin and region.inside(uj.reshape((1,-1))):
+            for uj, Lj in reversed(self.history):
+                buf = self._get_scratch(len(uj))
+                buf[0] = uj
+                if Lj >= Lmin and region.inside(buf):
                     ui, Li = uj, Lj
                     if self.log:
                         print("recovered using history", ui)
@@ -385,16 +462,16 @@ class SamplingPathStepSampler(StepSampler):
         # select starting point
         if Li is None:
             # choose a new random starting point
-            mask = region.inside(us)
-            assert mask.any(), ("None of the live points satisfies the current region!",
+            indices = self._live_inside_indices(region, us)
+            assert len(indices) > 0, ("None of the live points satisfies the current region!",
                 region.maxradiussq, region.u, region.unormed, us)
-            i = np.random.randint(mask.sum())
+            i = np.random.randint(len(indices))
             self.starti = i
-            ui = us[mask,:][i]
+            ui = us[indices[i],:].copy()
             if self.log:
                 print("starting at", ui)
-            assert np.logical_and(ui > 0, ui < 1).all(), ui
-            Li = Ls[mask][i]
+            assert _in_unit_cube(ui), ui
+            Li = Ls[indices[i]]
             self.start()
             self.history.append((ui, Li))
             self.last = (ui, Li)
@@ -404,8 +481,9 @@ class SamplingPathStepSampler(StepSampler):
             print("i: %d->%d (step %d)" % (self.lasti, inew, self.istep))
 
         # uold, _ = self.get_point(self.lasti)
-        _, uold, Lold = self.cache[self.lasti]
+        _, uold, Lold = self._cache_get(self.lasti)
         if plot:
+            import matplotlib.pyplot as plt
             plt.plot(uold[0], uold[1], 'd', color='brown', ms=4)
 
         uret, pret, Lret = uold, transform(uold), Lold
@@ -413,16 +491,20 @@ class SamplingPathStepSampler(StepSampler):
         nc = 0
         if inew != self.lasti:
             accept = False
-            if inew not in self.cache:
+            if not self._cache_has(inew):
                 unew, _ = self.get_point(inew)
                 if plot:
+                    import matplotlib.pyplot as plt
                     plt.plot(unew[0], unew[1], 'x', color='k', ms=4)
-                accept = np.logical_and(unew > 0, unew < 1).all() and region.inside(unew.reshape((1, -1)))
+                buf = self._get_scratch(len(unew))
+                buf[0] = unew
+                accept = _in_unit_cube(unew) and region.inside(buf)
                 if accept:
                     if plot:
+                        import matplotlib.pyplot as plt
                         plt.plot(unew[0], unew[1], '+', color='orange', ms=4)
                     pnew = transform(unew)
-                    Lnew = loglike(pnew.reshape((1, -1)))
+                    Lnew = loglike(pnew.reshape((1, -1)))[0]
                     nc = 1
                 else:
                     Lnew = -np.inf
@@ -431,7 +513,7 @@ class SamplingPathStepSampler(StepSampler):
                     self.deadends.add(inew)
                     self.adjust_outside_region()
             else:
-                _, unew, Lnew = self.cache[self.nexti]
+                _, unew, Lnew = self._cache_get(self.nexti)
                 # if plot:
                 #    plt.plot(unew[0], unew[1], 's', color='r', ms=2)
 
@@ -443,16 +525,18 @@ class SamplingPathStepSampler(StepSampler):
                 if self.log:
                     print(" -> inside.")
                 if plot:
+                    import matplotlib.pyplot as plt
                     plt.plot(unew[0], unew[1], 'o', color='g', ms=4)
                 self.adjust_accept(True, unew, pnew, Lnew, nc)
                 uret, pret, Lret = unew, pnew, Lnew
             else:
                 if plot:
+                    import matplotlib.pyplot as plt
                     plt.plot(unew[0], unew[1], '+', color='k', ms=2, alpha=0.3)
                 if self.log:
                     print(" -> outside.")
                 jump_successful = False
-                if inew not in self.cache and inew not in self.deadends:
+                if not self._cache_has(inew) and inew not in self.deadends:
                     # first time we try to go beyond
                     # try to reflect:
                     reflpoint, v = self.get_point(inew)
@@ -466,12 +550,15 @@ class SamplingPathStepSampler(StepSampler):
                     xk, vk = extrapolate_ahead(sign, reflpoint, vnew, contourpath=self.path)
 
                     if plot:
+                        import matplotlib.pyplot as plt
                         plt.plot([reflpoint[0], (-v + reflpoint)[0]], [reflpoint[1], (-v + reflpoint)[1]], '-', color='k', lw=0.5, alpha=0.5)
                         plt.plot([reflpoint[0], (vnew + reflpoint)[0]], [reflpoint[1], (vnew + reflpoint)[1]], '-', color='k', lw=1)
 
                     if self.log:
                         print("    trying", xk)
-                    accept = np.logical_and(xk > 0, xk < 1).all() and region.inside(xk.reshape((1, -1)))
+                    buf = self._get_scratch(len(xk))
+                    buf[0] = xk
+                    accept = _in_unit_cube(xk) and region.inside(buf)
                     if accept:
                         pk = transform(xk)
                         Lk = loglike(pk.reshape((1, -1)))[0]
@@ -503,7 +590,7 @@ class SamplingPathStepSampler(StepSampler):
                     self.adjust_accept(False, uret, pret, Lret, nc)
 
                 # self.adjust_accept(False, unew, pnew, Lnew, nc)
-                assert inew in self.cache or inew in self.deadends, (inew in self.cache, inew in self.deadends)
+                assert self._cache_has(inew) or inew in self.deadends, (self._cache_has(inew), inew in self.deadends)
         else:
             # stuck, proposal did not move us
             self.nstuck += 1
@@ -522,7 +609,9 @@ class SamplingPathStepSampler(StepSampler):
         if self.iresets >= self.nresets:
             if self.log:
                 print("walked %d paths; returning sample" % self.iresets)
-            self.adjust_scale(maxlength=len(uret)**0.5)
+            if self._maxlength is None:
+                self._maxlength = len(uret)**0.5
+            self.adjust_scale(maxlength=self._maxlength)
             self.start()
             self.last = None, None
             return uret, pret, Lret, nc
@@ -532,7 +621,13 @@ class SamplingPathStepSampler(StepSampler):
 
 
 class OtherSamplerProxy(object):
-    """Proxy for ClockedSamplers."""
+    """Proxy for ClockedSamplers.
+
+    The clocked protocol is serial: each proposed point depends on the
+    accept/reject outcome of the previous likelihood call, so evaluations
+    cannot be pipelined. Straight trajectory segments are instead
+    pre-evaluated in one batched call (see `presample_until`).
+    """
 
     def __init__(self, nnewdirections, sampler='steps', nsteps=0,
             balance=0.9, scale=0.1, nudge=1.1, log=False):
@@ -557,6 +652,12 @@ class OtherSamplerProxy(object):
         """
         self.nsteps = nsteps
         self.samplername = sampler
+        # resolve the sampler and jumper constructors once
+        self._sampler_class, self._jumper_class = {
+            'steps': (ClockedStepSampler, DirectJumper),
+            'bisect': (ClockedBisectSampler, DirectJumper),
+            'nuts': (ClockedNUTSSampler, IntervalJumper),
+        }[sampler]
         self.sampler = None
 
         self.scale = scale
@@ -574,23 +675,113 @@ class OtherSamplerProxy(object):
         self.naccepts = 0
         self.nrejects = 0
 
-        self.logstat = []
+        self.logstat = None
+        self._logstat_n = 0
         self.logstat_labels = ['accepted', 'scale']
 
+        # all parts are fixed at construction time
+        self._str = 'Proxy[%s](%dx%d steps, AR=%d%%)' % (sampler,
+            nnewdirections, nsteps, balance * 100)
+
+        # dual averaging state for step scale adaptation
+        # (Hoffman & Gelman 2014, Algorithm 5)
+        self._da_mu = np.log(10 * scale)
+        self._da_H = 0.0
+        self._da_log_scale_avg = np.log(scale)
+        self._da_m = 0
+
+        # memo of recently evaluated points, keyed by coordinate bytes
+        self._lcache = OrderedDict()
+
+        # persistent generator (PCG64) and buffer for direction draws
+        self._rng = np.random.default_rng()
+        self._dir_buf = None
+
+        # conservative bounding box of the current region
+        self._bbox_key = None
+        self._bbox = None
+
+        # reused row buffer for single-point batched calls
+        self._u_batch = None
+        self._maxlength = None
+
+    def _eval_point(self, u, transform, loglike):
+        """Evaluate ``loglike(transform(u))``, memoizing recent results.
+
+        Paths revisit points when a direction is reversed or a new
+        direction starts from the previous sample; the memo skips the
+        repeated likelihood call in those cases.
+        """
+        key = u.tobytes()
+        L = self._lcache.get(key)
+        if L is not None:
+            self._lcache.move_to_end(key)
+            return L
+        L = loglike(transform(self._as_row(u)))[0]
+        self.ncalls += 1
+        self._lcache[key] = L
+        if len(self._lcache) > 1024:
+            self._lcache.popitem(last=False)
+        return L
+
+    def _logstat_append(self, row):
+        """Log event `row`, growing the statistics array as needed."""
+        n = self._logstat_n
+        if self.logstat is None:
+            self.logstat = np.empty((64, len(self.logstat_labels)))
+        elif n == len(self.logstat):
+            grown = np.empty((2 * n, self.logstat.shape[1]))
+            grown[:n,:] = self.logstat
+            self.logstat = grown
+        self.logstat[n,:] = row
+        self._logstat_n = n + 1
+
+    def _as_row(self, u):
+        """Copy `u` into a reused (1, ndim) buffer for batched calls."""
+        if self._u_batch is None or self._u_batch.shape[1] != len(u):
+            self._u_batch = np.empty((1, len(u)))
+        self._u_batch[0] = u
+        return self._u_batch
+
+    def _maybe_inside(self, region, u):
+        """Cheap prefilter; returns False only if `u` is certainly outside.
+
+        Uses a conservative axis-aligned bounding box of the region
+        (live point extent, padded by the region radius mapped back to
+        cube space), so the full region.inside test can be skipped for
+        points far outside. Recomputed when the region or its radius
+        changes; disabled when dimensions wrap.
+        """
+        key = (id(region), region.maxradiussq)
+        if key != self._bbox_key:
+            layer = region.transformLayer
+            if layer.has_wraps or region.maxradiussq is None:
+                self._bbox = None
+            else:
+                r = region.maxradiussq**0.5
+                if hasattr(layer, 'invT'):
+                    delta = r * np.linalg.norm(layer.invT, axis=0)
+                else:
+                    delta = r * np.ravel(layer.std)
+                self._bbox = (region.u.min(axis=0) - delta,
+                    region.u.max(axis=0) + delta)
+            self._bbox_key = key
+        if self._bbox is None:
+            return True
+        lo, hi = self._bbox
+        return not ((u < lo).any() or (u > hi).any())
+
     def __str__(self):
         """Get string representation."""
-        return 'Proxy[%s](%dx%d steps, AR=%d%%)' % (self.samplername,
-            self.nnewdirections, self.nsteps, self.balance * 100)
+        return self._str
 
     def accumulate_statistics(self):
         """Accumulate statistics at end of step sequence."""
         self.nreflections += self.sampler.nreflections
         self.nreverses += self.sampler.nreverses
-        points = self.sampler.points
-        # range
-        ilo, _, _, _ = min(points)
-        ihi, _, _, _ = max(points)
-        self.nsteps_done += ihi - ilo
+        # range; the path indices are kept sorted
+        idx = self.sampler.contourpath.samplingpath._idx
+        self.nsteps_done += idx[-1] - idx[0]
 
         self.naccepts += self.stepper.naccepts
         self.nrejects += self.stepper.nrejects
@@ -598,37 +789,61 @@ class OtherSamplerProxy(object):
             print("%2d direction encountered %2d accepts, %2d rejects" % (
                 self.nrestarts, self.stepper.naccepts, self.stepper.nrejects))
 
-    def adjust_scale(self, maxlength):
-        """Adjust proposal scale, but not above maxlength."""
+    def adjust_scale(self, maxlength=None):
+        """Adjust proposal scale to target the *balance* acceptance rate.
+
+        Uses Nesterov dual averaging (Hoffman & Gelman 2014), which
+        converges to the target much faster than a fixed multiplicative
+        nudge and does not oscillate around it.
+        """
+        if maxlength is None:
+            maxlength = self._maxlength
         log = self.log
         if log:
             print("%2d | %2d %2d %2d | %f" % (self.nrestarts,
                 self.naccepts, self.nrejects, self.nreflections, self.scale))
-        self.logstat.append([self.naccepts / (self.naccepts + self.nrejects), self.scale])
-
-        if self.naccepts < (self.nrejects + self.naccepts) * self.balance:
-            if log:
-                print("adjusting scale %f down" % self.scale)
-            self.scale /= self.nudge
-        else:
-            if self.scale < maxlength or True:
-                if log:
-                    print("adjusting scale %f up" % self.scale)
-                self.scale *= self.nudge
+        accept_rate = self.naccepts / (self.naccepts + self.nrejects)
+        self._logstat_append([accept_rate, self.scale])
+
+        # standard settings from Hoffman & Gelman (2014)
+        gamma, t0, kappa = 0.05, 10., 0.75
+        self._da_m += 1
+        m = self._da_m
+        w = 1. / (m + t0)
+        self._da_H = (1 - w) * self._da_H + w * (self.balance - accept_rate)
+        log_scale = self._da_mu - m**0.5 / gamma * self._da_H
+        eta = m**-kappa
+        self._da_log_scale_avg = eta * log_scale + (1 - eta) * self._da_log_scale_avg
+        # cap to prevent runaway growth wasting likelihood evaluations
+        self.scale = min(np.exp(log_scale), maxlength)
+        if log:
+            print("adjusting scale to %f (acceptance rate %.2f)" % (
+                self.scale, accept_rate))
         assert self.scale > 1e-10, self.scale
 
     def startup(self, region, us, Ls):
         """Choose a new random starting point."""
         if self.log:
             print("starting from scratch...")
-        mask = region.inside(us)
-        assert mask.any(), ("Not all of the live points satisfy the current region!",
-            region.maxradiussq, region.u[~mask,:], region.unormed[~mask,:], us[~mask,:])
-        i = np.random.randint(mask.sum())
+        # unit cube diagonal; cap for the proposal scale
+        self._maxlength = us.shape[1]**0.5
+        # live points are inside the region except shortly after a region
+        # update; pick one directly and check only that single point,
+        # instead of running region.inside over all live points
+        i = self._rng.integers(len(us))
+        ui = us[i,:]
+        if not region.inside(self._as_row(ui)):
+            mask = region.inside(us)
+            assert mask.any(), ("None of the live points satisfy the current region!",
+                region.maxradiussq, region.u[~mask,:], region.unormed[~mask,:], us[~mask,:])
+            i = self._rng.choice(np.flatnonzero(mask))
+            ui = us[i,:]
         self.starti = i
-        ui = us[mask,:][i]
-        assert np.logical_and(ui > 0, ui < 1).all(), ui
-        Li = Ls[mask][i]
+        assert _in_unit_cube(ui), ui
+        Li = Ls[i]
+        # raw directions for all upcoming re-orientations, drawn at once;
+        # normalization and the current scale are applied at pop time
+        self._dir_buf = self._rng.standard_normal((self.nnewdirections, len(ui)))
         self.last = ui, Li
         self.ncalls = 0
         self.nrestarts = 0
@@ -647,25 +862,20 @@ class OtherSamplerProxy(object):
         if self.log:
             print("choosing random direction")
         ui, Li = self.last
-        v = generate_random_direction(ui, region, scale=self.scale)
+        if self._dir_buf is not None and self.nrestarts < len(self._dir_buf):
+            v = self._dir_buf[self.nrestarts]
+            v *= self.scale / np.linalg.norm(v)
+        else:
+            v = generate_random_direction(ui, region, scale=self.scale, rng=self._rng)
         # v = generate_region_random_direction(ui, region, scale=self.scale)
 
         self.nrestarts += 1
 
-        if self.sampler is None or True:
+        if self.sampler is None:
             samplingpath = SamplingPath(ui, v, Li)
             contourpath = ContourSamplingPath(samplingpath, region)
-            if self.samplername == 'steps':
-                self.sampler = ClockedStepSampler(contourpath, log=self.log)
-                self.stepper = DirectJumper(self.sampler, self.nsteps, log=self.log)
-            elif self.samplername == 'bisect':
-                self.sampler = ClockedBisectSampler(contourpath, log=self.log)
-                self.stepper = DirectJumper(self.sampler, self.nsteps, log=self.log)
-            elif self.samplername == 'nuts':
-                self.sampler = ClockedNUTSSampler(contourpath, log=self.log)
-                self.stepper = IntervalJumper(self.sampler, self.nsteps, log=self.log)
-            else:
-                assert False
+            self.sampler = self._sampler_class(contourpath, log=self.log)
+            self.stepper = self._jumper_class(self.sampler, self.nsteps, log=self.log)
 
     def __next__(self, region, Lmin, us, Ls, transform, loglike, ndraw=40, plot=False):
         """Get next point.
@@ -696,7 +906,7 @@ class OtherSamplerProxy(object):
             # print("wandered out of L constraint; resetting", ui[0])
             ui, Li = None, None
 
-        if Li is not None and not region.inside(ui.reshape((1,-1))):
+        if Li is not None and not region.inside(self._as_row(ui)):
             # region was updated and we are not inside anymore
             # so reset
             ui, Li = None, None
@@ -707,18 +917,25 @@ class OtherSamplerProxy(object):
             self.start_direction(region)
 
         self.stepper.prepare_jump()
+        if getattr(self.sampler, 'speculative_expand', False) and self.nsteps > 1:
+            # batch-evaluate the straight trajectory towards the target in
+            # one vectorized transform/loglike call; reflections are left
+            # to the step-by-step loop below
+            self.ncalls += self.sampler.presample_until(
+                self.nsteps, transform, loglike, Lmin)
         Llast = None
-        gaps = {}
+        # status per reachable step index: 0 untried, 1 known gap, 2 checked OK.
+        # negative indices wrap around; the index range is narrower than the
+        # array, so they cannot collide with the positive ones.
+        gaps = np.zeros(2 * self.nsteps + 3, dtype=np.int8)
         while True:
             if not self.sampler.is_done():
                 u, is_independent = self.sampler.next(Llast=Llast)
                 if not is_independent and u is not None:
                     # should evaluate point
                     Llast = None
-                    if region.inside(u.reshape((1,-1))):
-                        p = transform(u.reshape((1, -1)))
-                        L = loglike(p)[0]
-                        self.ncalls += 1
+                    if self._maybe_inside(region, u) and region.inside(self._as_row(u)):
+                        L = self._eval_point(u, transform, loglike)
                         if L > Lmin:
                             Llast = L
                     else:
@@ -729,21 +946,20 @@ class OtherSamplerProxy(object):
                     unew, Lnew = self.stepper.make_jump(gaps)
                     break  # done!
                 # check that u is allowed:
-                assert i not in gaps
-                gaps[i] = True
-                if region.inside(u.reshape((1,-1))):
-                    p = transform(u.reshape((1, -1)))
-                    L = loglike(p)[0]
-                    self.ncalls += 1
+                assert gaps[i] == 0
+                gaps[i] = 1
+                if self._maybe_inside(region, u) and region.inside(self._as_row(u)):
+                    L = self._eval_point(u, transform, loglike)
                     if L > Lmin:
                         # point is OK
-                        gaps[i] = False
+                        gaps[i] = 2
                         unew, Lnew = u, L
                         break
 
         # if self.log: print("after %d calls, jumped to" % self.ncalls, unew)
-        assert np.isfinite(unew).all(), unew
-        assert np.isfinite(Lnew).all(), Lnew
+        # one scalar reduction; a NaN or inf component makes the sum non-finite
+        assert np.isfinite(unew.sum()), unew
+        assert -np.inf < Lnew < np.inf, Lnew
 
         self.accumulate_statistics()
         # forget sampler
@@ -754,7 +970,7 @@ class OtherSamplerProxy(object):
         # print("got a sample:", unew)
         if self.nrestarts >= self.nnewdirections:
             xnew = transform(unew)
-            self.adjust_scale(maxlength=len(unew)**0.5)
+            self.adjust_scale()
             # forget as starting point
             self.last = None, None
             self.nrestarts = 0
@@ -764,16 +980,19 @@ class OtherSamplerProxy(object):
 
     def plot(self, filename):
         """Plot sampler statistics."""
-        if len(self.logstat) == 0:
+        if self._logstat_n == 0:
             return
 
-        parts = np.transpose(self.logstat)
-        plt.figure(figsize=(10, 1 + 3 * len(parts)))
-        for i, (label, part) in enumerate(zip(self.logstat_labels, parts)):
-            plt.subplot(len(parts), 1, 1 + i)
-            plt.ylabel(label)
-            plt.plot(part)
-            if np.min(part) > 0:
-                plt.yscale('log')
-        plt.savefig(filename, bbox_inches='tight')
-        plt.close()
+        import matplotlib.pyplot as plt
+        logstat = self.logstat[:self._logstat_n,:]
+        mins = logstat.min(axis=0)
+        fig, axes = plt.subplots(logstat.shape[1], 1,
+            figsize=(10, 1 + 3 * logstat.shape[1]), squeeze=False)
+        for i, label in enumerate(self.logstat_labels):
+            ax = axes[i,0]
+            ax.set_ylabel(label)
+            ax.plot(logstat[:,i])
+            if mins[i] > 0:
+                ax.set_yscale('log')
+        fig.savefig(filename, bbox_inches='tight')
+        plt.close(fig)
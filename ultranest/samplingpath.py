@@ -4,9 +4,14 @@ Supports reflections at unit cube boundaries, and regions.
 """
 
 
+import bisect
+import math
+
 import numpy as np
 from numpy.linalg import norm
-import matplotlib.pyplot as plt
+
+# gate consistency checks in the hot geometry kernels; enable when debugging
+DEBUG = False
 
 
 def nearest_box_intersection_line(ray_origin, ray_direction, fwd=True):
@@ -40,31 +45,82 @@ def nearest_box_intersection_line(ray_origin, ray_direction, fwd=True):
         axes which change direction at pN
 
     """
-    # make sure ray starts inside the box
-    assert (ray_origin >= 0).all(), ray_origin
-    assert (ray_origin <= 1).all(), ray_origin
-    assert ((ray_direction**2).sum()**0.5 > 1e-200).all(), ray_direction
+    if DEBUG:
+        # make sure ray starts inside the box
+        assert (ray_origin >= 0).all(), ray_origin
+        assert (ray_origin <= 1).all(), ray_origin
+        assert ((ray_direction**2).sum()**0.5 > 1e-200).all(), ray_direction
 
     # step size
     with np.errstate(divide='ignore', invalid='ignore'):
         m = 1. / ray_direction
-        n = m * (ray_origin - 0.5)
-        k = np.abs(m) * 0.5
-        # line coordinates of intersection
+        # line coordinates of intersection, -n +- k with
+        # n = m * (ray_origin - 0.5) and k = abs(m) * 0.5,
+        # computed in-place to avoid temporaries
+        t2 = 0.5 - ray_origin
+        t2 *= m
+        np.abs(m, out=m)
+        m *= 0.5
         # find first intersecting coordinate
         if fwd:
-            t2 = -n + k
-            tF = np.nanmin(t2)
-            iF = np.where(t2 == tF)[0]
+            t2 += m
+            iN = np.nanargmin(t2)
         else:
-            t1 = -n - k
-            tF = np.nanmax(t1)
-            iF = np.where(t1 == tF)[0]
+            t2 -= m
+            iN = np.nanargmax(t2)
+        tF = t2[iN]
+        # at a corner several axes are hit at the same time
+        iF = np.flatnonzero(t2 == tF)
 
     pF = ray_origin + ray_direction * tF
-    eps = 1e-6
-    assert (pF >= -eps).all(), (pF, ray_origin, ray_direction)
-    assert (pF <= 1 + eps).all(), (pF, ray_origin, ray_direction)
+    if DEBUG:
+        eps = 1e-6
+        assert (pF >= -eps).all(), (pF, ray_origin, ray_direction)
+        assert (pF <= 1 + eps).all(), (pF, ray_origin, ray_direction)
+    pF[pF < 0] = 0
+    pF[pF > 1] = 1
+    return pF, tF, iF
+
+
+def nearest_box_intersection_line_batch(ray_origins, ray_directions, fwd=True):
+    """Compute intersection of many lines (rays) and a unit box (0:1 in all axes).
+
+    Vectorized version of :func:`nearest_box_intersection_line` for
+    rays stored as arrays (one row per ray). A single call amortizes
+    the numpy dispatch overhead over all rays.
+
+    Parameters
+    -----------
+    ray_origins: array of vectors
+        starting points of the lines, shape (nrays, ndim)
+    ray_directions: array of vectors
+        line direction vectors, shape (nrays, ndim)
+
+    Returns
+    --------
+    p: array of vectors
+        intersection points, shape (nrays, ndim)
+    t: array of floats
+        intersection point distances from the ray origins,
+        in units of the ray directions
+    i: array of ints
+        axis which changes direction at each intersection point
+
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        m = 1. / ray_directions
+        t2 = 0.5 - ray_origins
+        t2 *= m
+        np.abs(m, out=m)
+        m *= 0.5
+        if fwd:
+            t2 += m
+            iF = np.nanargmin(t2, axis=1)
+        else:
+            t2 -= m
+            iF = np.nanargmax(t2, axis=1)
+    tF = t2[np.arange(len(t2)), iF]
+    pF = ray_origins + ray_directions * tF.reshape((-1, 1))
     pF[pF < 0] = 0
     pF[pF > 1] = 1
     return pF, tF, iF
@@ -88,12 +144,15 @@ def box_line_intersection(ray_origin, ray_direction):
     return (pN, tN, iN), (pF, tF, iF)
 
 
-def linear_steps_with_reflection(ray_origin, ray_direction, t, wrapped_dims=None):
+def linear_steps_with_reflection(ray_origin, ray_direction, t, wrapped_dims=None, out=None):
     """Go `t` steps in direction `ray_direction` from `ray_origin`.
 
     Reflect off the unit cube if encountered, respecting wrapped dimensions.
     In any case, the distance should be ``t * ray_direction``.
 
+    If `out` is given, the end point is written into it (it must not
+    alias `ray_origin` or `ray_direction`).
+
     Returns
     --------
     new_point: vector
@@ -103,48 +162,112 @@ def linear_steps_with_reflection(ray_origin, ray_direction, t, wrapped_dims=None
 
     """
     if t == 0:
+        if out is not None:
+            out[:] = ray_origin
+            return out, ray_direction
         return ray_origin, ray_direction
-    if t < 0:
-        new_point, new_direction = linear_steps_with_reflection(ray_origin, -ray_direction, -t)
-        return new_point, -new_direction
+    flip = t < 0
+    if flip:
+        # walk the reversed direction forwards; the returned direction
+        # is negated back below. As before, wrapped-dims handling only
+        # applies to forward steps.
+        t = -t
+        ray_direction = -ray_direction
+        wrapped_dims = None
+
+    # common case: the whole step stays inside the unit cube.
+    # two cheap reductions decide this without the reflection loop.
+    if out is None:
+        tentative = ray_origin + t * ray_direction
+    else:
+        np.multiply(ray_direction, t, out=out)
+        out += ray_origin
+        tentative = out
+    if tentative.min() >= 0 and tentative.max() <= 1:
+        if flip:
+            np.negative(ray_direction, out=ray_direction)
+        return tentative, ray_direction
 
     if wrapped_dims is not None:
         reflected = np.zeros(len(ray_origin), dtype=bool)
+        # precompute branchless update coefficients:
+        # wrapped axes keep their direction and mirror the coordinate,
+        # other axes reflect the direction and keep the coordinate.
+        wrap_sign = np.where(wrapped_dims, 1.0, -1.0)
+        origin_sign = -wrap_sign
+        origin_off = np.where(wrapped_dims, 1.0, 0.0)
 
     tleft = 1.0 * t
+    # when flipped, ray_direction is already our own fresh array
+    direction_owned = flip
+    # cache the inverse direction across reflections: a reflection only
+    # flips the sign of some components, so the magnitudes (and thus k)
+    # never change and no further division is needed.
+    with np.errstate(divide='ignore', invalid='ignore'):
+        m = 1. / ray_direction
+        k = np.abs(m) * 0.5
     while True:
-        p, t, i = nearest_box_intersection_line(ray_origin, ray_direction, fwd=True)
-        # print(p, t, i, ray_origin, ray_direction)
-        assert np.isfinite(p).all()
-        assert t >= 0, t
+        # nearest box intersection going forward (inlined from
+        # nearest_box_intersection_line, using the cached m and k)
+        with np.errstate(invalid='ignore'):
+            t2 = 0.5 - ray_origin
+            t2 *= m
+            t2 += k
+        t = t2[np.nanargmin(t2)]
+        if DEBUG:
+            assert t >= 0, t
         if tleft <= t:  # stopping before reaching any border
-            assert np.all(ray_origin + tleft * ray_direction >= 0), (ray_origin, tleft, ray_direction)
-            assert np.all(ray_origin + tleft * ray_direction <= 1), (ray_origin, tleft, ray_direction)
-            return ray_origin + tleft * ray_direction, ray_direction
+            if DEBUG:
+                assert np.all(ray_origin + tleft * ray_direction >= 0), (ray_origin, tleft, ray_direction)
+                assert np.all(ray_origin + tleft * ray_direction <= 1), (ray_origin, tleft, ray_direction)
+            if out is None:
+                new_point = ray_origin + tleft * ray_direction
+            else:
+                np.multiply(ray_direction, tleft, out=out)
+                out += ray_origin
+                new_point = out
+            if flip:
+                np.negative(ray_direction, out=ray_direction)
+            return new_point, ray_direction
+        # at a corner several axes reflect at the same time
+        i = np.flatnonzero(t2 == t)
         # go to reflection point
+        p = ray_origin + ray_direction * t
+        if DEBUG:
+            assert np.isfinite(p).all(), p
+        np.clip(p, 0, 1, out=p)
         ray_origin = p
-        assert np.isfinite(ray_origin).all(), ray_origin
-        # reflect
-        ray_direction = ray_direction.copy()
+        # reflect. copy the caller's direction once, then flip in place
+        # on any further reflections.
+        if not direction_owned:
+            ray_direction = ray_direction.copy()
+            direction_owned = True
         if wrapped_dims is None:
             ray_direction[i] *= -1
+            m[i] *= -1
         else:
             # if we already once bumped into that (wrapped) axis,
             # do not continue but return this as end point
             if np.logical_and(reflected[i], wrapped_dims[i]).any():
+                if out is not None:
+                    out[:] = ray_origin
+                    return out, ray_direction
                 return ray_origin, ray_direction
 
             # note which axes we already flipped
             reflected[i] = True
 
             # in wrapped axes, we can keep going. Otherwise, reflects
-            ray_direction[i] *= np.where(wrapped_dims[i], 1, -1)
+            ray_direction[i] *= wrap_sign[i]
+            m[i] *= wrap_sign[i]
 
             # in the i axes, we should wrap the coordinates
-            assert np.logical_or(np.isclose(ray_origin[i], 1), np.isclose(ray_origin[i], 0)).all(), ray_origin[i]
-            ray_origin[i] = np.where(wrapped_dims[i], 1 - ray_origin[i], ray_origin[i])
+            if DEBUG:
+                assert np.logical_or(np.isclose(ray_origin[i], 1), np.isclose(ray_origin[i], 0)).all(), ray_origin[i]
+            ray_origin[i] = origin_off[i] + origin_sign[i] * ray_origin[i]
 
-        assert np.isfinite(ray_direction).all(), ray_direction
+        if DEBUG:
+            assert np.isfinite(ray_direction).all(), ray_direction
         # reduce remaining distance
         tleft -= t
 
@@ -163,6 +286,10 @@ def get_sphere_tangent(sphere_center, edge_point):
 
     """
     arrow = sphere_center - edge_point
+    if arrow.ndim == 1:
+        # np.dot goes to BLAS without an elementwise temporary
+        arrow /= np.sqrt(np.dot(arrow, arrow))
+        return arrow
     return arrow / norm(arrow)
 
 
@@ -182,12 +309,24 @@ def get_sphere_tangents(sphere_center, edge_point):
 
     """
     arrow = sphere_center - edge_point
-    return arrow / norm(arrow, axis=1).reshape((-1, 1))
+    # one-pass row norms, applied in place to the fresh difference array
+    n = np.einsum('ij,ij->i', arrow, arrow)
+    np.sqrt(n, out=n)
+    arrow /= n.reshape((-1, 1))
+    return arrow
+
 
+def reflect(v, normal, out=None):
+    """Reflect vector ``v`` off a ``normal`` vector, return new direction vector.
 
-def reflect(v, normal):
-    """Reflect vector ``v`` off a ``normal`` vector, return new direction vector."""
-    return v - 2 * (normal * v).sum() * normal
+    If `out` is given, the result is written into it (and returned).
+    """
+    scale = 2 * np.dot(normal, v)
+    if out is None:
+        return v - scale * normal
+    np.multiply(normal, -scale, out=out)
+    out += v
+    return out
 
 
 def distances(l, o, r=1):
@@ -209,13 +348,13 @@ def distances(l, o, r=1):
         If no intersection, throws AssertError.
 
     """
-    loc = (l * o).sum()
-    osqrnorm = (o**2).sum()
-    # print(loc.shape, loc.shape, osqrnorm.shape)
+    loc = float(np.dot(l, o))
+    osqrnorm = float(np.dot(o, o))
     rootterm = loc**2 - osqrnorm + r**2
     # make sure we are crossing the sphere
-    assert (rootterm > 0).all(), rootterm
-    return -loc + rootterm**0.5, -loc - rootterm**0.5
+    assert rootterm > 0, rootterm
+    root = math.sqrt(rootterm)
+    return -loc + root, -loc - root
 
 
 def isunitlength(vec):
@@ -230,68 +369,16 @@ def angle(a, b):
     """
     # anorm = (a**2).sum()**0.5
     # bnorm = (b**2).sum()**0.5
-    return (a * b).sum()  # / anorm / bnorm
+    return np.dot(a, b)  # / anorm / bnorm
 
 
-def extrapolate_ahead(dj, xj, vj, contourpath=None):
+def extrapolate_ahead(dj, xj, vj, contourpath=None, out=None):
     """Make `di` steps of size `vj` from `xj`.
 
     Reflect off unit cube if necessary.
     """
     assert dj == int(dj)
-
-    # optimistically try to go there directly
-
-    xk, vk = linear_steps_with_reflection(xj, vj, dj)
-
-    return xk, vk  # deactivate feature below
-
-    if contourpath is None:
-        return xk, vk
-
-    # check if we can already tell that the point will be outside
-    region = contourpath.region
-    if contourpath.region.inside(xk.reshape((1, -1))):
-        return xk, vk
-
-    # find first point outside region
-    sign = 1 if dj > 0 else -1
-    d = np.arange(0, dj, sign)
-    first_point_outside = dj, xk, vk
-    for di in d:
-        xi, vi = linear_steps_with_reflection(xj, vj, di)
-        if not region.inside(xk.reshape((1, -1))):
-            first_point_outside = di, xi, vi
-            break
-
-    # reflect at this point (first outside)
-    dout, reflpoint, v = first_point_outside
-
-    if dout == 0:
-        # already the starting point is outside.
-        # return extrapolation and hope caller handles it
-        return xk, vk
-
-    # reversing:
-    normal = contourpath.gradient(reflpoint)  # , v * sign)
-    if normal is None:
-        vnew = -v
-    else:
-        vnew = (v - 2 * angle(normal, v) * normal) * sign
-    assert vnew.shape == v.shape, (vnew.shape, v.shape)
-    assert np.isclose(norm(vnew), norm(v)), (vnew, v, norm(vnew), norm(v))
-
-    # make one step (xl replaces first_point_outside/reflpoint)
-    xl, vl = linear_steps_with_reflection(reflpoint, vnew, sign)
-    # how many steps are still to do?
-    dleft = dj - dout
-
-    # make that many step in that direction, by recursing.
-
-    # it is possible that this point is also outside. The next iteration
-    # will catch that case.
-
-    return extrapolate_ahead(dleft, xl, vl, contourpath=contourpath)
+    return linear_steps_with_reflection(xj, vj, dj, out=out)
 
 
 def interpolate(i, points, fwd_possible, rwd_possible, contourpath=None):
@@ -307,7 +394,7 @@ def interpolate(i, points, fwd_possible, rwd_possible, contourpath=None):
     i: int
         position on track to return.
     points: list of tuples (index, coordinate, direction, loglike)
-        points on the path
+        points on the path, sorted by index
     fwd_possible: bool
         whether the path could be extended in the positive direction.
     rwd_possible: bool
@@ -316,35 +403,44 @@ def interpolate(i, points, fwd_possible, rwd_possible, contourpath=None):
         Use region to reflect. Not used at the moment.
 
     """
-    points_before = [(j, xj, vj, Lj) for j, xj, vj, Lj in points if j <= i]
-    points_after = [(j, xj, vj, Lj) for j, xj, vj, Lj in points if j >= i]
+    # the points are sorted by index, so the two neighbours of i can
+    # be found by bisection (search on the tuples' first entry)
+    lo, hi = 0, len(points)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if points[mid][0] < i:
+            lo = mid + 1
+        else:
+            hi = mid
+    # lo is now the first position with index >= i
+
+    if lo < len(points) and points[lo][0] == i:
+        # we have this exact point in the chain
+        _, xj, vj, Lj = points[lo]
+        return xj, vj, Lj, True
 
     # check if the point after is really after i
-    if len(points_after) == 0 and not fwd_possible:
+    if lo == len(points) and not fwd_possible:
         # the path cannot continue, and i does not exist.
         # print("    interpolate_point %d: the path cannot continue fwd, and i does not exist." % i)
-        j, xj, vj, Lj = max(points_before)
+        j, xj, vj, Lj = points[-1]
         return xj, vj, Lj, False
 
     # check if the point before is really before i
-    if len(points_before) == 0 and not rwd_possible:
+    if lo == 0 and not rwd_possible:
         # the path cannot continue, and i does not exist.
-        k, xk, vk, Lk = min(points_after)
+        k, xk, vk, Lk = points[0]
         # print("    interpolate_point %d: the path cannot continue rwd, and i does not exist." % i)
         return xk, vk, Lk, False
 
-    if len(points_before) == 0 or len(points_after) == 0:
+    if lo == 0 or lo == len(points):
         # return None, None, None, False
         raise KeyError("cannot extrapolate outside path")
 
-    j, xj, vj, Lj = max(points_before)
-    k, xk, vk, Lk = min(points_after)
+    j, xj, vj, Lj = points[lo - 1]
+    k, xk, vk, Lk = points[lo]
 
     # print("    interpolate_point %d between %d-%d" % (i, j, k))
-    if j == i:  # we have this exact point in the chain
-        return xj, vj, Lj, True
-
-    assert not k == i  # otherwise the above would be true too
 
     # expand_to_step explores each reflection in detail, so
     # any points with change in v should have j == i
@@ -354,11 +450,12 @@ def interpolate(i, points, fwd_possible, rwd_possible, contourpath=None):
     # occur, and change v without requiring a intermediate point.
 
     # j....i....k
-    xl1, vj1 = extrapolate_ahead(i - j, xj, vj, contourpath=contourpath)
-    xl2, vj2 = extrapolate_ahead(i - k, xk, vk, contourpath=contourpath)
-    assert np.allclose(xl1, xl2), (xl1, xl2, i, j, k, xj, vj, xk, vk)
-    assert np.allclose(vj1, vj2), (xl1, vj1, xl2, vj2, i, j, k, xj, vj, xk, vk)
-    xl = xl1
+    xl, vj1 = extrapolate_ahead(i - j, xj, vj, contourpath=contourpath)
+    if DEBUG:
+        # extrapolating from the other side must give the same point
+        xl2, vj2 = extrapolate_ahead(i - k, xk, vk, contourpath=contourpath)
+        assert np.allclose(xl, xl2), (xl, xl2, i, j, k, xj, vj, xk, vk)
+        assert np.allclose(vj1, vj2), (xl, vj1, xl2, vj2, i, j, k, xj, vj, xk, vk)
 
     # xl = interpolate_between_two_points(i, xj, j, xk, k)
     # the new point is then just a linear interpolation
@@ -378,12 +475,19 @@ class SamplingPath(object):
     `L`: loglikelihood value
     """
 
-    def __init__(self, x0, v0, L0):
+    def __init__(self, x0, v0, L0, dtype=None):
         """Initialise with path starting point.
 
         Starting point (`x0`), direction (`v0`) and
         loglikelihood value (`L0`) of the path. Is given index 0.
+
+        If `dtype` is set (e.g. float32), coordinates and directions
+        are stored in that precision to halve the memory traffic.
+        The default keeps the caller's arrays as-is: the interpolation
+        consistency checks work to float64 precision, so reduced
+        precision is opt-in.
         """
+        self.dtype = dtype
         self.reset(x0, v0, L0)
 
     def add(self, i, xi, vi, Li):
@@ -392,31 +496,68 @@ class SamplingPath(object):
         assert len(xi.shape) == 1, (xi, xi.shape)
         assert len(vi.shape) == 1, (vi, vi.shape)
         assert len(np.shape(Li)) == 0, (Li, Li.shape)
-        self.points.append((i, xi, vi, Li))
+        if self.dtype is not None:
+            xi = np.asarray(xi, dtype=self.dtype)
+            vi = np.asarray(vi, dtype=self.dtype)
+        # keep points sorted by index, so that the end points are
+        # points[0] and points[-1], and lookups can bisect.
+        k = bisect.bisect(self._idx, i)
+        self._idx.insert(k, i)
+        self.points.insert(k, (i, xi, vi, Li))
+        # the new point also changes interpolations between other points
+        self._interpolation_cache = {}
 
     def reset(self, x0, v0, L0):
         """Reset path, start from ``x0, v0, L0``."""
         self.points = []
+        self._idx = []
+        self._interpolation_cache = {}
         self.add(0, x0, v0, L0)
         self.fwd_possible = True
         self.rwd_possible = True
 
+    @property
+    def fwd_possible(self):
+        """Whether the path can be extended in the positive direction."""
+        return self._fwd_possible
+
+    @fwd_possible.setter
+    def fwd_possible(self, value):
+        self._fwd_possible = value
+        self._interpolation_cache = {}
+
+    @property
+    def rwd_possible(self):
+        """Whether the path can be extended in the negative direction."""
+        return self._rwd_possible
+
+    @rwd_possible.setter
+    def rwd_possible(self, value):
+        self._rwd_possible = value
+        self._interpolation_cache = {}
+
     def plot(self, **kwargs):
         """Plot the current path.
 
         Only uses first two dimensions.
         """
-        x = np.array([x for i, x, v, L in sorted(self.points)])
+        import matplotlib.pyplot as plt
+        x = np.array([x for i, x, v, L in self.points])
         p, = plt.plot(x[:,0], x[:,1], 'o ', **kwargs)
-        ilo, _, _, _ = min(self.points)
-        ihi, _, _, _ = max(self.points)
+        ilo, _, _, _ = self.points[0]
+        ihi, _, _, _ = self.points[-1]
         x = np.array([self.interpolate(i)[0] for i in range(ilo, ihi + 1)])
         kwargs['color'] = p.get_color()
         plt.plot(x[:,0], x[:,1], 'o-', ms=4, mfc='None', **kwargs)
 
     def interpolate(self, i):
         """Interpolate point with index `i` on path."""
-        return interpolate(i, self.points, fwd_possible=self.fwd_possible, rwd_possible=self.rwd_possible)
+        try:
+            return self._interpolation_cache[i]
+        except KeyError:
+            result = interpolate(i, self.points, fwd_possible=self.fwd_possible, rwd_possible=self.rwd_possible)
+            self._interpolation_cache[i] = result
+            return result
 
     def extrapolate(self, i):
         """Advance beyond the current path, extrapolate from the end point.
@@ -433,11 +574,11 @@ class SamplingPath(object):
 
         """
         if i >= 0:
-            j, xj, vj, Lj = max(self.points)
+            j, xj, vj, Lj = self.points[-1]
             deltai = i - j
             assert deltai > 0, ("should be extrapolating", i, j)
         else:
-            j, xj, vj, Lj = min(self.points)
+            j, xj, vj, Lj = self.points[0]
             deltai = i - j
             assert deltai < 0, ("should be extrapolating", i, j)
 
@@ -456,6 +597,8 @@ class ContourSamplingPath(object):
         self.samplingpath = samplingpath
         self.points = self.samplingpath.points
         self.region = region
+        self._unormed_sq = None
+        self._unormed_id = None
 
     def add(self, i, x, v, L):
         """Add point `xi`, direction `vi` and value `Li` with index `i` to the path."""
@@ -463,10 +606,16 @@ class ContourSamplingPath(object):
 
     def interpolate(self, i):
         """Interpolate point with index `i` on path."""
-        return interpolate(i, self.samplingpath.points,
-            fwd_possible=self.samplingpath.fwd_possible,
-            rwd_possible=self.samplingpath.rwd_possible,
-            contourpath=self)
+        cache = self.samplingpath._interpolation_cache
+        try:
+            return cache[i]
+        except KeyError:
+            result = interpolate(i, self.samplingpath.points,
+                fwd_possible=self.samplingpath.fwd_possible,
+                rwd_possible=self.samplingpath.rwd_possible,
+                contourpath=self)
+            cache[i] = result
+            return result
 
     def extrapolate(self, i):
         """Advance beyond the current path, extrapolate from the end point.
@@ -483,11 +632,11 @@ class ContourSamplingPath(object):
 
         """
         if i >= 0:
-            j, xj, vj, Lj = max(self.samplingpath.points)
+            j, xj, vj, Lj = self.samplingpath.points[-1]
             deltai = i - j
             assert deltai > 0, ("should be extrapolating", i, j)
         else:
-            j, xj, vj, Lj = min(self.samplingpath.points)
+            j, xj, vj, Lj = self.samplingpath.points[0]
             deltai = i - j
             assert deltai < 0, ("should be extrapolating", i, j)
 
@@ -527,18 +676,28 @@ class ContourSamplingPath(object):
 
         """
         if plot:
+            import matplotlib.pyplot as plt
             plt.plot(reflpoint[0], reflpoint[1], '+ ', color='k', ms=10)
 
         # check which the reflections the ellipses would make
         region = self.region
         bpts = region.transformLayer.transform(reflpoint.reshape((1,-1)))
-        dist = ((bpts - region.unormed)**2).sum(axis=1)
+        b = bpts[0]
+        # squared distances via the expansion |u|^2 + |b|^2 - 2 u.b,
+        # so the |u|^2 row norms can be cached across gradient calls
+        # (region.unormed is replaced, not mutated, on region updates)
+        if self._unormed_id != id(region.unormed):
+            self._unormed_sq = np.einsum('ij,ij->i', region.unormed, region.unormed)
+            self._unormed_id = id(region.unormed)
+        dist = self._unormed_sq - 2 * np.dot(region.unormed, b)
+        dist += np.dot(b, b)
         assert dist.shape == (len(region.unormed),), (dist.shape, len(region.unormed))
         nearby = dist < region.maxradiussq
         assert nearby.shape == (len(region.unormed),), (nearby.shape, len(region.unormed))
         if not nearby.any():
             nearby = dist == dist.min()
-        sphere_centers = region.u[nearby,:]
+        if plot:
+            sphere_centers = region.u[nearby,:]
 
         tsphere_centers = region.unormed[nearby,:]
         nlive, ndim = region.unormed.shape
@@ -550,11 +709,14 @@ class ContourSamplingPath(object):
         tt = get_sphere_tangent(tsphere_center, bpts.flatten())
         assert tt.shape == tsphere_center.shape, (tt.shape, tsphere_center.shape)
 
-        # convert back to u space
-        sphere_center = region.transformLayer.untransform(tsphere_center)
-        t = region.transformLayer.untransform(tt * 1e-3 + tsphere_center) - sphere_center
+        # convert back to u space; one stacked call to halve the
+        # transformLayer dispatch overhead
+        back = region.transformLayer.untransform(np.vstack((tsphere_center, tt * 1e-3 + tsphere_center)))
+        sphere_center = back[0,:]
+        t = back[1,:] - sphere_center
 
         if plot:
+            import matplotlib.pyplot as plt
             tt_all = get_sphere_tangent(tsphere_centers, bpts)
             t_all = region.transformLayer.untransform(tt_all * 1e-3 + tsphere_centers) - sphere_centers
 
@@ -583,7 +745,8 @@ class ContourSamplingPath(object):
 
         # compute new vector
         normal = t / norm(t)
-        isunitlength(normal)
+        if DEBUG:
+            isunitlength(normal)
         assert normal.shape == t.shape, (normal.shape, t.shape)
 
         return normal
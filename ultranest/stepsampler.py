@@ -8,31 +8,70 @@ do not terminate at the same number of iterations.
 
 import numpy as np
 
-import matplotlib.pyplot as plt
 
+_transform_cache = [None, None, None]
 
-def generate_random_direction(ui, region, scale=1):
+
+def _cached_transform(transformLayer, ui):
+    """Transform point `ui`, reusing the last result when possible.
+
+    Direction generators and movers often transform the same current
+    point several times in a row; a one-slot cache avoids the repeated
+    matrix work. Keyed on object identity of both arguments.
+    """
+    layer, uref, ti = _transform_cache
+    if layer is transformLayer and uref is ui:
+        return ti
+    ti = transformLayer.transform(ui)
+    _transform_cache[:] = [transformLayer, ui, ti]
+    return ti
+
+
+def _in_unit_cube(x):
+    """Check whether point `x` lies strictly inside the unit cube."""
+    return np.abs(x - 0.5).max() < 0.5
+
+
+def _in_unit_cube_mask(xs):
+    """Row-wise strict unit cube membership for points `xs`."""
+    return np.abs(xs - 0.5).max(axis=1) < 0.5
+
+
+def generate_random_direction(ui, region, scale=1, rng=None, out=None):
     """Draw uniform direction vector in unit cube space of length `scale`.
 
-    Region is not used.
+    Region is not used. A `numpy.random.Generator` can be passed as
+    *rng* (default: the legacy global state), and *out* as a
+    preallocated result buffer.
     """
-    v = np.random.normal(0, 1, size=len(ui))
-    v *= scale / (v**2).sum()**0.5
+    if rng is None:
+        v = np.random.normal(0, 1, size=len(ui))
+    else:
+        v = rng.standard_normal(len(ui), out=out)
+    v *= scale / np.linalg.norm(v)
     return v
 
 
+_unit_basis = {}
+
+
 def generate_cube_oriented_direction(ui, region):
     """Draw a unit direction vector in direction of a random unit cube axes.
 
     `region` is not used.
+
+    Returns a read-only row of a shared identity matrix;
+    callers must not modify it in place.
     """
     ndim = len(ui)
+    basis = _unit_basis.get(ndim)
+    if basis is None:
+        basis = np.eye(ndim)
+        basis.setflags(write=False)
+        _unit_basis[ndim] = basis
     # choose axis
     j = np.random.randint(ndim)
-    # use doubling procedure to identify left and right maxima borders
-    v = np.zeros(ndim)
-    v[j] = 1.0
-    return v
+    return basis[j]
 
 
 def generate_region_oriented_direction(ui, region, tscale=1, scale=None):
@@ -42,7 +81,7 @@ def generate_region_oriented_direction(ui, region, tscale=1, scale=None):
     If not, the vector length in transformed space is `tscale`.
     """
     ndim = len(ui)
-    ti = region.transformLayer.transform(ui)
+    ti = _cached_transform(region.transformLayer, ui)
 
     # choose axis in transformed space:
     j = np.random.randint(ndim)
@@ -52,24 +91,29 @@ def generate_region_oriented_direction(ui, region, tscale=1, scale=None):
     uj = region.transformLayer.untransform(ti + tv)
     v = uj - ui
     if scale is not None:
-        v *= scale / (v**2).sum()**0.5
+        v *= scale / np.linalg.norm(v)
     return v
 
 
-def generate_region_random_direction(ui, region, scale=1):
+def generate_region_random_direction(ui, region, scale=1, rng=None):
     """Draw a direction vector in a random direction of the region.
 
     The vector length is `scale` (in unit cube space).
+    A `numpy.random.Generator` can be passed as *rng*
+    (default: the legacy global state).
     """
-    ti = region.transformLayer.transform(ui)
+    ti = _cached_transform(region.transformLayer, ui)
 
     # choose axis in transformed space:
-    ti = np.random.normal(ti, 1)
+    if rng is None:
+        ti = np.random.normal(ti, 1)
+    else:
+        ti = ti + rng.standard_normal(len(ti))
     # ti *= scale / (ti**2).sum()**0.5
     # convert back to unit cube space:
     uj = region.transformLayer.untransform(ti)
     v = uj - ui
-    v *= scale / (v**2).sum()**0.5
+    v *= scale / np.linalg.norm(v)
     return v
 
 
@@ -87,11 +131,11 @@ def generate_mixture_random_direction(ui, region, scale=1, uniform_weight=1e-6):
 
     """
     v1 = generate_random_direction(ui, region)
-    v1 /= (v1**2).sum()**0.5
+    v1 /= np.linalg.norm(v1)
     v2 = generate_region_random_direction(ui, region)
-    v2 /= (v2**2).sum()**0.5
+    v2 /= np.linalg.norm(v2)
     v = (v1 * uniform_weight + v2 * (1 - uniform_weight))
-    v *= scale * (v2**2).sum()**0.5
+    v *= scale * np.linalg.norm(v2)
     return v
 
 
@@ -151,6 +195,8 @@ class StepSampler(object):
         self.next_scale = self.scale
         self.last = None, None
         self.nudge = 1.1**(1. / self.nsteps)
+        # constant-folded wide adjustment factor used in the hot path
+        self.nudge10 = self.nudge**10
         self.nsteps_nudge = 1.01
         adaptive_nsteps_options = (False, 'proposal-total-distances-NN', 'proposal-summed-distances-NN', 
             'proposal-total-distances', 'proposal-summed-distances', 
@@ -164,11 +210,22 @@ class StepSampler(object):
         self.region_filter = region_filter
         self.log = log
         
-        self.logstat = []
+        # statistics log; allocated on first event, grown by doubling
+        self.logstat = None
+        self._logstat_n = 0
         self.logstat_labels = ['rejection_rate', 'scale', 'steps']
         if adaptive_nsteps:
             self.logstat_labels += ['jump-distance', 'reference-distance']
 
+        # scratch row for single-point region membership checks
+        self._scratch = None
+        # cached region membership of the live points
+        self._mask_cache = None
+        # pool of pre-filtered proposal candidates for the current point
+        self._candidate_pool = None
+        self._candidate_pool_ui = None
+        self._candidate_pool_scale = None
+
     def __str__(self):
         """Get string representation."""
         if not self.adaptive_nsteps:
@@ -176,14 +233,28 @@ class StepSampler(object):
         else:
             return type(self).__name__ + '(adaptive_nsteps=%s)' % self.adaptive_nsteps
 
+    def _logstat_append(self, row):
+        """Log event `row`, padding with NaN up to the label count."""
+        n = self._logstat_n
+        if self.logstat is None:
+            self.logstat = np.full((1024, len(self.logstat_labels)), np.nan)
+        elif n == len(self.logstat):
+            grown = np.full((2 * n, self.logstat.shape[1]), np.nan)
+            grown[:n,:] = self.logstat
+            self.logstat = grown
+        self.logstat[n,:len(row)] = row
+        self._logstat_n = n + 1
+
     def plot(self, filename):
         """Plot sampler statistics."""
-        if len(self.logstat) == 0:
+        if self._logstat_n == 0:
             return
 
+        import matplotlib.pyplot as plt
+        logstat = self.logstat[:self._logstat_n,:]
         plt.figure(figsize=(10, 1 + 3 * len(self.logstat_labels)))
         for i, label in enumerate(self.logstat_labels):
-            part = [entry[i] for entry in self.logstat]
+            part = logstat[:,i]
             plt.subplot(len(self.logstat_labels), 1, 1 + i)
             plt.ylabel(label)
             plt.plot(part)
@@ -196,7 +267,7 @@ class StepSampler(object):
             if np.min(part) > 0:
                 plt.yscale('log')
         plt.savefig(filename, bbox_inches='tight')
-        np.savetxt(filename + '.txt.gz', self.logstat, 
+        np.savetxt(filename + '.txt.gz', logstat, 
             header=','.join(self.logstat_labels), delimiter=',')
         plt.close()
 
@@ -204,6 +275,52 @@ class StepSampler(object):
         """Move around ui. Stub to be implemented."""
         raise NotImplementedError()
 
+    def _get_scratch(self, ndim):
+        """Get a lazily allocated ``(1, ndim)`` scratch row.
+
+        For region membership checks of single points, to avoid
+        allocating a fresh 2d array per check. The content is only
+        valid until the next call.
+        """
+        if self._scratch is None or self._scratch.shape[1] != ndim:
+            self._scratch = np.empty((1, ndim))
+        return self._scratch
+
+    def _live_inside_indices(self, region, us):
+        """Get indices of the live points `us` lying inside `region`.
+
+        The result is cached, since the live points and region change
+        rarely compared to how often the step sampler is called.
+        """
+        key = (id(us), id(region), region.maxradiussq)
+        if self._mask_cache is not None and self._mask_cache[0] == key:
+            return self._mask_cache[1]
+        indices = np.flatnonzero(region.inside(us))
+        self._mask_cache = (key, indices)
+        return indices
+
+    def _pop_candidate(self, ui):
+        """Take the next pooled candidate for point `ui`, if still valid.
+
+        The pool is discarded when the chain moved away from `ui` or the
+        proposal scale changed by more than 10% since the pool was drawn.
+        """
+        if self._candidate_pool is None or len(self._candidate_pool) == 0:
+            return None
+        if not np.array_equal(self._candidate_pool_ui, ui) or \
+                not 0.9 * self._candidate_pool_scale <= self.scale <= 1.1 * self._candidate_pool_scale:
+            self._candidate_pool = None
+            return None
+        unew = self._candidate_pool[0, :]
+        self._candidate_pool = self._candidate_pool[1:, :]
+        return unew
+
+    def _refill_candidate_pool(self, ui, candidates):
+        """Store already filtered proposal `candidates` for point `ui`."""
+        self._candidate_pool = candidates
+        self._candidate_pool_ui = ui.copy()
+        self._candidate_pool_scale = self.scale
+
     def adjust_outside_region(self):
         """Adjust proposal given that we landed outside region."""
         print("ineffective proposal scale (%g). shrinking..." % self.scale)
@@ -211,16 +328,13 @@ class StepSampler(object):
         # Usually the region is very generous.
         # Being here means that the scale is very wrong and we are probably stuck.
         # Adjust it and restart the chain
-        self.scale /= self.nudge**10
-        self.next_scale /= self.nudge**10
+        self.scale /= self.nudge10
+        self.next_scale /= self.nudge10
         assert self.scale > 0
         assert self.next_scale > 0
         # reset chain
         self.last = None, None
-        if self.adaptive_nsteps:
-            self.logstat.append([-1.0, self.scale, self.nsteps, np.nan, np.nan])
-        else:
-            self.logstat.append([-1.0, self.scale, self.nsteps])
+        self._logstat_append([-1.0, self.scale, self.nsteps])
 
     def adjust_accept(self, accepted, unew, pnew, Lnew, nc):
         """Adjust proposal given that we have been `accepted` at a new point after `nc` calls."""
@@ -230,7 +344,7 @@ class StepSampler(object):
             self.last = unew, Lnew
             self.history.append((unew.copy(), Lnew.copy()))
         else:
-            self.next_scale /= self.nudge**10
+            self.next_scale /= self.nudge10
             self.nrejects += 1
             self.history.append(self.history[-1])
         assert self.next_scale > 0, self.next_scale
@@ -255,7 +369,7 @@ class StepSampler(object):
             d2 = ((((tproposed[0] - tproposed)**2).sum(axis=1))**0.5).sum()
             far_enough = d2 > self.mean_pair_distance / ndim
             
-            self.logstat[-1] = self.logstat[-1] + [d2, self.mean_pair_distance]
+            self.logstat[self._logstat_n - 1, 3:5] = d2, self.mean_pair_distance
             #print(self.adaptive_nsteps, self.nsteps, self.nrejects, far_enough, self.mean_pair_distance, d2)
         elif self.adaptive_nsteps == 'proposal-total-distances-NN':
             # compute mean vector of each proposed jump
@@ -265,7 +379,7 @@ class StepSampler(object):
             d2 = ((((tproposed[0] - tproposed)**2).sum(axis=1))**0.5).sum()
             far_enough = d2 > region.maxradiussq**0.5
 
-            self.logstat[-1] = self.logstat[-1] + [d2, region.maxradiussq**0.5]
+            self.logstat[self._logstat_n - 1, 3:5] = d2, region.maxradiussq**0.5
             #print(self.adaptive_nsteps, self.nsteps, self.nrejects, far_enough, region.maxradiussq**0.5, d2)
         elif self.adaptive_nsteps == 'proposal-summed-distances':
             # compute sum of distances from each jump
@@ -274,14 +388,14 @@ class StepSampler(object):
             far_enough = d2 > self.mean_pair_distance / ndim
             #print(self.adaptive_nsteps, self.nsteps, self.nrejects, far_enough, self.mean_pair_distance, d2)
 
-            self.logstat[-1] = self.logstat[-1] + [d2, self.mean_pair_distance]
+            self.logstat[self._logstat_n - 1, 3:5] = d2, self.mean_pair_distance
         elif self.adaptive_nsteps == 'proposal-summed-distances-NN':
             # compute sum of distances from each jump
             tproposed = region.transformLayer.transform(np.asarray([u for u, _ in self.history]))
             d2 = (((tproposed[1:,:] - tproposed[:-1,:])**2).sum(axis=1)**0.5).sum()
             far_enough = d2 > region.maxradiussq**0.5
             
-            self.logstat[-1] = self.logstat[-1] + [d2, region.maxradiussq**0.5]
+            self.logstat[self._logstat_n - 1, 3:5] = d2, region.maxradiussq**0.5
             #print(self.adaptive_nsteps, self.nsteps, self.nrejects, far_enough, region.maxradiussq**0.5, d2)
         elif self.adaptive_nsteps == 'proposal-summed-distances-min-NN':
             # compute sum of distances from each jump
@@ -289,7 +403,7 @@ class StepSampler(object):
             d2 = (np.abs(tproposed[1:,:] - tproposed[:-1,:]).sum(axis=1)).min()
             far_enough = d2 > region.maxradiussq**0.5
             
-            self.logstat[-1] = self.logstat[-1] + [d2, region.maxradiussq**0.5]
+            self.logstat[self._logstat_n - 1, 3:5] = d2, region.maxradiussq**0.5
             #print(self.adaptive_nsteps, self.nsteps, self.nrejects, far_enough, region.maxradiussq**0.5, d2)
         elif self.adaptive_nsteps == 'proposal-variance-min':
             # compute sum of distances from each jump
@@ -297,7 +411,7 @@ class StepSampler(object):
             d2 = tproposed.std(axis=0).min()
             far_enough = d2 > self.mean_pair_distance / ndim
             
-            self.logstat[-1] = self.logstat[-1] + [d2, self.mean_pair_distance]
+            self.logstat[self._logstat_n - 1, 3:5] = d2, self.mean_pair_distance
             #print(self.adaptive_nsteps, self.nsteps, self.nrejects, far_enough, region.maxradiussq**0.5, d2)
         elif self.adaptive_nsteps == 'proposal-variance-min-NN':
             # compute sum of distances from each jump
@@ -305,7 +419,7 @@ class StepSampler(object):
             d2 = tproposed.std(axis=0).min()
             far_enough = d2 > region.maxradiussq**0.5
 
-            self.logstat[-1] = self.logstat[-1] + [d2, region.maxradiussq**0.5]
+            self.logstat[self._logstat_n - 1, 3:5] = d2, region.maxradiussq**0.5
             #print(self.adaptive_nsteps, self.nsteps, self.nrejects, far_enough, region.maxradiussq**0.5, d2)
         elif self.adaptive_nsteps == 'move-distance':
             # compute distance from start to end
@@ -315,7 +429,7 @@ class StepSampler(object):
             d2 = ((tstart - tfinal)**2).sum()
             far_enough = d2 > region.maxradiussq
             
-            self.logstat[-1] = self.logstat[-1] + [d2, region.maxradiussq**0.5]
+            self.logstat[self._logstat_n - 1, 3:5] = d2, region.maxradiussq**0.5
             #print(self.adaptive_nsteps, self.nsteps, self.nrejects, far_enough, region.maxradiussq**0.5, d2)
         elif self.adaptive_nsteps == 'move-distance-midway':
             # compute distance from start to end
@@ -326,7 +440,7 @@ class StepSampler(object):
             d2 = ((tstart - tfinal)**2).sum()
             far_enough = d2 > region.maxradiussq
             
-            self.logstat[-1] = self.logstat[-1] + [d2, region.maxradiussq**0.5]
+            self.logstat[self._logstat_n - 1, 3:5] = d2, region.maxradiussq**0.5
             #print(self.adaptive_nsteps, self.nsteps, self.nrejects, far_enough, region.maxradiussq**0.5, d2)
         else:
             assert False, self.adaptive_nsteps
@@ -340,7 +454,7 @@ class StepSampler(object):
 
     def finalize_chain(self, region=None, Lmin=None, Ls=None):
         """Store chain statistics and adapt proposal."""
-        self.logstat.append([self.nrejects / self.nsteps, self.scale, self.nsteps])
+        self._logstat_append([self.nrejects / self.nsteps, self.scale, self.nsteps])
         if self.log:
             ustart, Lstart = self.history[0]
             ufinal, Lfinal = self.history[-1]
@@ -360,10 +474,10 @@ class StepSampler(object):
         if self.adaptive_nsteps:
             self.adapt_nsteps(region=region)
         
-        if self.next_scale > self.scale * self.nudge**10:
-            self.next_scale = self.scale * self.nudge**10
-        elif self.next_scale < self.scale / self.nudge**10:
-            self.next_scale = self.scale / self.nudge**10
+        if self.next_scale > self.scale * self.nudge10:
+            self.next_scale = self.scale * self.nudge10
+        elif self.next_scale < self.scale / self.nudge10:
+            self.next_scale = self.scale / self.nudge10
         #print("updating scale: %g -> %g" % (self.scale, self.next_scale))
         self.scale = self.next_scale
         self.last = None, None
@@ -413,8 +527,10 @@ class StepSampler(object):
 
         if Li is None and self.history:
             # try to resume from a previous point above the current contour
-            for j, (uj, Lj) in enumerate(self.history[::-1]):
-                if Lj > Lmin and region.inside(uj.reshape((1,-1))):
+            for j, (uj, Lj) in enumerate(reversed(self.history)):
+                buf = self._get_scratch(len(uj))
+                buf[0] = uj
+                if Lj > Lmin and region.inside(buf):
                     ui, Li = uj, Lj
                     #print("recovering at point %d/%d " % (j+1, len(self.history)))
                     self.last = ui, Li
@@ -442,36 +558,35 @@ class StepSampler(object):
             self.history.append((ui.copy(), Li.copy()))
             del i
 
-        while True:
-            unew = self.move(ui, region, ndraw=ndraw, plot=plot)
+        nc = 0
+        # reuse left-over pre-filtered candidates for this point, if any
+        unew = self._pop_candidate(ui)
+        while unew is None:
+            candidates = self.move(ui, region, ndraw=ndraw, plot=plot)
             if plot:
-                plt.plot([ui[0], unew[:,0]], [ui[1], unew[:,1]], '-', color='k', lw=0.5)
+                import matplotlib.pyplot as plt
+                plt.plot([ui[0], candidates[:,0]], [ui[1], candidates[:,1]], '-', color='k', lw=0.5)
                 plt.plot(ui[0], ui[1], 'd', color='r', ms=4)
-                plt.plot(unew[:,0], unew[:,1], 'x', color='r', ms=4)
-            mask = np.logical_and(unew > 0, unew < 1).all(axis=1)
-            unew = unew[mask,:]
-            nc = 0
-            if self.region_filter:
-                mask = inside_region(region, unew, ui)
-                if mask.any():
-                    i = np.where(mask)[0][0]
-                else:
-                    self.adjust_outside_region()
-                    continue
-            else:
-                i = 0
-
-            if len(unew) == 0:
+                plt.plot(candidates[:,0], candidates[:,1], 'x', color='r', ms=4)
+            mask = _in_unit_cube_mask(candidates)
+            candidates = candidates[mask,:]
+            if self.region_filter and len(candidates) > 0:
+                mask = inside_region(region, candidates, ui)
+                candidates = candidates[mask,:]
+
+            if len(candidates) == 0:
                 self.adjust_outside_region()
                 continue
-            break
-        
-        unew = unew[i,:]
+            # keep the whole filtered batch; later rejected steps from
+            # the same point can consume it without redrawing
+            self._refill_candidate_pool(ui, candidates)
+            unew = self._pop_candidate(ui)
         pnew = transform(unew.reshape((1, -1)))
         Lnew = loglike(pnew)[0]
         nc = 1
         if Lnew > Lmin:
             if plot:
+                import matplotlib.pyplot as plt
                 plt.plot(unew[0], unew[1], 'o', color='g', ms=4)
             self.adjust_accept(True, unew, pnew, Lnew, nc)
         else:
@@ -494,8 +609,10 @@ class CubeMHSampler(StepSampler):
     def move(self, ui, region, ndraw=1, plot=False):
         """Move in cube space."""
         # propose in that direction
-        jitter = np.random.normal(0, 1, size=(ndraw, len(ui))) * self.scale
-        unew = ui.reshape((1, -1)) + jitter
+        # scale and shift in-place to avoid intermediate arrays
+        unew = np.random.normal(0, 1, size=(ndraw, len(ui)))
+        unew *= self.scale
+        unew += ui
         return unew
 
 
@@ -504,9 +621,10 @@ class RegionMHSampler(StepSampler):
 
     def move(self, ui, region, ndraw=1, plot=False):
         """Move in transformLayer space."""
-        ti = region.transformLayer.transform(ui)
-        jitter = np.random.normal(0, 1, size=(ndraw, len(ui))) * self.scale
-        tnew = ti.reshape((1, -1)) + jitter
+        ti = _cached_transform(region.transformLayer, ui)
+        tnew = np.random.normal(0, 1, size=(ndraw, len(ui)))
+        tnew *= self.scale
+        tnew += ti
         unew = region.transformLayer.untransform(tnew)
         return unew
 
@@ -531,19 +649,18 @@ class CubeSliceSampler(StepSampler):
 
     def adjust_accept(self, accepted, unew, pnew, Lnew, nc):
         """Adjust proposal given that we have been `accepted` at a new point after `nc` calls."""
-        v, left, right, u = self.interval
         if not self.found_left:
             if accepted:
-                self.interval = (v, left * 2, right, u)
+                self._slice_left *= 2
             else:
                 self.found_left = True
         elif not self.found_right:
             if accepted:
-                self.interval = (v, left, right * 2, u)
+                self._slice_right *= 2
             else:
                 self.found_right = True
                 # adjust scale
-                if -left > self.next_scale or right > self.next_scale:
+                if -self._slice_left > self.next_scale or self._slice_right > self.next_scale:
                     self.next_scale *= 1.1
                 else:
                     self.next_scale /= 1.1
@@ -558,14 +675,11 @@ class CubeSliceSampler(StepSampler):
             else:
                 self.nrejects += 1
                 # shrink current interval
-                if u == 0:
-                    pass
-                elif u < 0:
-                    left = u
+                u = self._slice_u
+                if u < 0:
+                    self._slice_left = u
                 elif u > 0:
-                    right = u
-
-                self.interval = (v, left, right, u)
+                    self._slice_right = u
 
     def adjust_outside_region(self):
         """Adjust proposal given that we landed outside region."""
@@ -574,21 +688,21 @@ class CubeSliceSampler(StepSampler):
     def move(self, ui, region, ndraw=1, plot=False):
         """Advance the slice sampling move."""
         if self.interval is None:
-            v = self.generate_direction(ui, region)
-
             # expand direction until it is surely outside
-            left = -self.scale
-            right = self.scale
+            self._slice_v = self.generate_direction(ui, region)
+            self._slice_left = -self.scale
+            self._slice_right = self.scale
+            self._slice_u = 0
             self.found_left = False
             self.found_right = False
-            u = 0
+            self.interval = True
 
-            self.interval = (v, left, right, u)
-
-        else:
-            v, left, right, u = self.interval
+        v = self._slice_v
+        left = self._slice_left
+        right = self._slice_right
 
         if plot:
+            import matplotlib.pyplot as plt
             plt.plot([(ui + v * left)[0], (ui + v * right)[0]],
                 [(ui + v * left)[1], (ui + v * right)[1]],
                 ':o', color='k', lw=2, alpha=0.3)
@@ -617,19 +731,36 @@ class CubeSliceSampler(StepSampler):
                     self.next_scale /= 1.1
                 #print("adjusting scale...", self.next_scale)
 
-        while True:
+        if not self.region_filter:
             u = np.random.uniform(left, right)
             xj = ui + v * u
+            self._slice_u = u
+            return xj.reshape((1, -1))
 
-            if not self.region_filter or inside_region(region, xj.reshape((1, -1)), ui):
-                self.interval = (v, left, right, u)
-                return xj.reshape((1, -1))
-            else:
+        # With region filtering, pre-draw a block of uniforms and test
+        # them against the region in one vectorized call, instead of one
+        # region.inside round-trip per shrink iteration.
+        while True:
+            ublock = np.random.uniform(left, right, size=8)
+            xs = ui.reshape((1, -1)) + v.reshape((1, -1)) * ublock.reshape((-1, 1))
+            mask = inside_region(region, xs, ui)
+            for u, xj, inside in zip(ublock, xs, mask):
+                if not left < u < right:
+                    # interval already shrank past this draw;
+                    # skipping keeps the draw uniform on the new interval
+                    continue
+                if inside:
+                    self._slice_left = left
+                    self._slice_right = right
+                    self._slice_u = u
+                    return xj.reshape((1, -1))
                 if u < 0:
                     left = u
+                    self._slice_left = u
                 else:
                     right = u
-                self.interval = (v, left, right, u)
+                    self._slice_right = u
+                self._slice_u = u
 
 
 class RegionSliceSampler(CubeSliceSampler):
@@ -643,20 +774,48 @@ class RegionSliceSampler(CubeSliceSampler):
 class RegionSequentialSliceSampler(CubeSliceSampler):
     """Slice sampler, sequentially iterating region axes."""
 
+    _basis_cache = None
+
+    def _get_axis_basis(self, ui, region):
+        """Get normalized unit-cube directions of all transformLayer axes.
+
+        Affine layers (no wrapped dimensions) map axes independently of
+        the current point, so the basis is computed once per layer and
+        cached. Returns None for wrapped layers, which need the local
+        directions at `ui`.
+        """
+        layer = region.transformLayer
+        if layer.has_wraps:
+            return None
+        if self._basis_cache is not None and self._basis_cache[0] is layer:
+            return self._basis_cache[1]
+        ndim = len(ui)
+        ti = layer.transform(ui)
+        basis = layer.untransform(ti + np.eye(ndim) * 1e-3)
+        basis -= ui
+        basis /= np.linalg.norm(basis, axis=1).reshape((-1, 1))
+        self._basis_cache = (layer, basis)
+        return basis
+
     def generate_direction(self, ui, region, scale=1):
         """Choose from region.transformLayer the next axis iteratively."""
         ndim = len(ui)
-        ti = region.transformLayer.transform(ui)
-
         # choose axis in transformed space:
         j = self.axis_index % ndim
         self.axis_index = j + 1
+
+        basis = self._get_axis_basis(ui, region)
+        if basis is not None:
+            return basis[j] * scale
+
+        # wrapped layer: recover the axis direction at the current point
+        ti = _cached_transform(region.transformLayer, ui)
         tv = np.zeros(ndim)
         tv[j] = 1.0
         # convert back to unit cube space:
         uj = region.transformLayer.untransform(ti + tv * 1e-3)
         v = uj - ui
-        v *= scale / (v**2).sum()**0.5
+        v *= scale / np.linalg.norm(v)
         return v
 
 
@@ -728,7 +887,7 @@ class SpeedVariableRegionSliceSampler(CubeSliceSampler):
     def generate_direction(self, ui, region, scale=1):
         """Generate a slice sampling direction, using only some of the axes."""
         ndim = len(ui)
-        ti = region.transformLayer.transform(ui)
+        ti = _cached_transform(region.transformLayer, ui)
 
         # choose random axis in transformed space
         j = np.random.randint(ndim)
@@ -746,6 +905,6 @@ class SpeedVariableRegionSliceSampler(CubeSliceSampler):
         uk[active_dims] = uj[active_dims]
 
         v = uk - ui
-        v *= scale / (v**2).sum()**0.5
+        v *= scale / np.linalg.norm(v)
         return v
 